@@ -7,8 +7,6 @@ import argparse
 import os
 import sys
 
-import yaml
-
 # Ensure src is importable when running without installation.
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SRC = os.path.join(ROOT, "src")
@@ -16,6 +14,15 @@ if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
 from eval.runner import run_eval  # noqa: E402
+from utils.file_cache import cached_yaml  # noqa: E402
+
+
+def _unquote(value: str) -> str:
+    """Strip surrounding whitespace and one pair of matching quotes."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
 
 
 def _load_dotenv(path: str) -> None:
@@ -31,7 +38,7 @@ def _load_dotenv(path: str) -> None:
                 continue
             key, value = line.split("=", 1)
             key = key.strip()
-            value = value.strip().strip('"').strip("'")
+            value = _unquote(value)
             if key and key not in os.environ:
                 os.environ[key] = value
 
@@ -46,8 +53,7 @@ def main() -> None:
     _load_dotenv(os.path.join(ROOT, ".env"))
     _load_dotenv(os.path.abspath(os.path.join(ROOT, os.pardir, ".env")))
 
-    with open(args.config, "r") as f:
-        cfg = yaml.safe_load(f)
+    cfg = cached_yaml(args.config)
 
     run_dir = run_eval(cfg)
     print(f"Outputs saved to: {run_dir}")
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from .schema import TaskExample
 
 LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
+# Fallback field names probed when the dataset config does not name a field.
+_QUESTION_FIELDS = ("query", "question", "text", "prompt")
+_CONTEXT_FIELDS = ("context", "passage", "background")
+_CHOICES_FIELDS = ("choices", "options", "candidates", "answers")
+_LABEL_FIELDS = ("gold", "label", "answer", "target")
+_ID_FIELDS = ("id", "qid", "uid")
+
 
 def _first_present(example: Dict[str, Any], candidates: Iterable[str]) -> Optional[str]:
     """Return the first field name that exists in the example."""
@@ -48,6 +56,15 @@ def _normalize_choices(raw_choices: Any) -> Optional[List[str]]:
     return None
 
 
+@lru_cache(maxsize=256)
+def _choice_lookup(choices: Tuple[str, ...]) -> Dict[str, int]:
+    """Map lowercased choice text to its first index; shared across examples."""
+    lookup: Dict[str, int] = {}
+    for i, c in enumerate(choices):
+        lookup.setdefault(c.lower(), i)
+    return lookup
+
+
 def _label_to_index(label_val: Any, choices: List[str]) -> Optional[int]:
     """Convert a label value into a choice index."""
     if label_val is None or choices is None:
@@ -71,11 +88,8 @@ def _label_to_index(label_val: Any, choices: List[str]) -> Optional[int]:
             idx = int(stripped)
             if 0 <= idx < len(choices):
                 return idx
-        # Fallback to exact text match.
-        lower = stripped.lower()
-        for i, c in enumerate(choices):
-            if c.lower() == lower:
-                return i
+        # Fallback to exact (case-insensitive) text match.
+        return _choice_lookup(tuple(choices)).get(stripped.lower())
     return None
 
 
@@ -89,88 +103,94 @@ def _index_to_letter(idx: int) -> str:
     return LETTERS[idx]
 
 
-def adapt_example(
-    example: Dict[str, Any],
-    idx: int,
+def make_adapter(
     ds_cfg: Dict[str, Any],
     features: Any = None,
-) -> Optional[TaskExample]:
-    """Adapt a raw dataset example to the unified TaskExample schema."""
-    question_field = ds_cfg.get("question_field") or _first_present(
-        example, ["query", "question", "text", "prompt"]
-    )
-    context_field = ds_cfg.get("context_field") or _first_present(
-        example, ["context", "passage", "background"]
-    )
-    choices_field = ds_cfg.get("choices_field") or _first_present(
-        example, ["choices", "options", "candidates", "answers"]
-    )
-    label_field = ds_cfg.get("label_field") or _first_present(
-        example, ["gold", "label", "answer", "target"]
-    )
-    id_field = ds_cfg.get("id_field") or _first_present(example, ["id", "qid", "uid"])
-
-    if question_field is None:
-        return None
+) -> Callable[[Dict[str, Any], int], Optional[TaskExample]]:
+    """Resolve per-dataset settings once and return a per-example adapter."""
+    question_cfg = ds_cfg.get("question_field")
+    context_cfg = ds_cfg.get("context_field")
+    choices_cfg = ds_cfg.get("choices_field")
+    label_cfg = ds_cfg.get("label_field")
+    id_cfg = ds_cfg.get("id_field")
+    task_type = ds_cfg.get("task_type", "classification")
+    dataset_prefix = ds_cfg.get("name", "dataset")
+    meta_base = {
+        "dataset": ds_cfg.get("name"),
+        "hf_path": ds_cfg.get("hf_path"),
+        "split": ds_cfg.get("split"),
+    }
+    # Feature label names only depend on the label field, so memoize per field.
+    label_names_by_field: Dict[str, Optional[List[str]]] = {}
+
+    def adapt(example: Dict[str, Any], idx: int) -> Optional[TaskExample]:
+        """Adapt a single raw example using the precomputed dataset settings."""
+        question_field = question_cfg or _first_present(example, _QUESTION_FIELDS)
+        if question_field is None:
+            return None
+        context_field = context_cfg or _first_present(example, _CONTEXT_FIELDS)
+        choices_field = choices_cfg or _first_present(example, _CHOICES_FIELDS)
+        label_field = label_cfg or _first_present(example, _LABEL_FIELDS)
+        id_field = id_cfg or _first_present(example, _ID_FIELDS)
+
+        question = str(example[question_field]).strip()
+        context = None
+        if context_field:
+            context_val = example.get(context_field)
+            if context_val is not None:
+                context = str(context_val).strip()
+
+        raw_choices = example.get(choices_field) if choices_field else None
+        choices = _normalize_choices(raw_choices)
+
+        # Infer label names from features when choices are missing.
+        if choices is None and label_field:
+            if label_field not in label_names_by_field:
+                label_names_by_field[label_field] = _infer_label_names(features, label_field)
+            label_names = label_names_by_field[label_field]
+            if label_names:
+                choices = label_names
+
+        label_val = example.get(label_field) if label_field else None
+
+        # Index, letter, numeric-string and text labels all resolve the same way.
+        label_idx = _label_to_index(label_val, choices) if choices else None
+
+        if choices and label_idx is not None:
+            label = _index_to_letter(label_idx)
+            label_text = choices[label_idx]
+        else:
+            label = "" if label_val is None else str(label_val).strip()
+            label_text = None
 
-    question = str(example[question_field]).strip()
-    context = None
-    if context_field:
-        context_val = example.get(context_field)
-        if context_val is not None:
-            context = str(context_val).strip()
-
-    raw_choices = example.get(choices_field) if choices_field else None
-    choices = _normalize_choices(raw_choices)
-
-    # Infer label names from features when choices are missing.
-    if choices is None and label_field:
-        label_names = _infer_label_names(features, label_field)
-        if label_names:
-            choices = label_names
-
-    label_val = example.get(label_field) if label_field else None
-    label_type = ds_cfg.get("label_type")
-
-    label_idx = None
-    if choices:
-        if label_type == "index":
-            label_idx = _label_to_index(label_val, choices)
-        elif label_type == "string":
-            label_idx = _label_to_index(label_val, choices)
+        if not label:
+            return None
+
+        if id_field and example.get(id_field) is not None:
+            example_id = f"{dataset_prefix}-{example.get(id_field)}"
         else:
-            label_idx = _label_to_index(label_val, choices)
+            example_id = f"{dataset_prefix}-{idx}"
 
-    if choices and label_idx is not None:
-        label = _index_to_letter(label_idx)
-        label_text = choices[label_idx]
-    else:
-        label = "" if label_val is None else str(label_val).strip()
-        label_text = None
+        meta = {**meta_base, "label_text": label_text, "label_index": label_idx}
 
-    if not label:
-        return None
+        return TaskExample(
+            id=example_id,
+            task_type=task_type,
+            question=question,
+            choices=choices,
+            context=context,
+            label=label,
+            meta=meta,
+        )
 
-    dataset_prefix = ds_cfg.get("name", "dataset")
-    if id_field and example.get(id_field) is not None:
-        example_id = f"{dataset_prefix}-{example.get(id_field)}"
-    else:
-        example_id = f"{dataset_prefix}-{idx}"
+    return adapt
 
-    meta = {
-        "dataset": ds_cfg.get("name"),
-        "hf_path": ds_cfg.get("hf_path"),
-        "split": ds_cfg.get("split"),
-        "label_text": label_text,
-        "label_index": label_idx,
-    }
 
-    return TaskExample(
-        id=example_id,
-        task_type=ds_cfg.get("task_type", "classification"),
-        question=question,
-        choices=choices,
-        context=context,
-        label=label,
-        meta=meta,
-    )
+def adapt_example(
+    example: Dict[str, Any],
+    idx: int,
+    ds_cfg: Dict[str, Any],
+    features: Any = None,
+) -> Optional[TaskExample]:
+    """Adapt a raw dataset example to the unified TaskExample schema."""
+    return make_adapter(ds_cfg, features)(example, idx)
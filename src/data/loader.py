@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import math
 import random
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
-from .adapters import adapt_example
+from .adapters import make_adapter
 from .schema import TaskExample
 
 
-def _load_hf_dataset(ds_cfg: Dict[str, Any]):
+def _load_hf_dataset(ds_cfg: Dict[str, Any], streaming: bool = False):
     """Load a HuggingFace dataset split, with fallbacks if the split is missing."""
     from datasets import load_dataset
 
@@ -22,8 +22,8 @@ def _load_hf_dataset(ds_cfg: Dict[str, Any]):
     for sp in splits_to_try:
         try:
             if name:
-                return load_dataset(path, name, split=sp)
-            return load_dataset(path, split=sp)
+                return load_dataset(path, name, split=sp, streaming=streaming)
+            return load_dataset(path, split=sp, streaming=streaming)
         except Exception as exc:
             last_err = exc
             continue
@@ -32,8 +32,24 @@ def _load_hf_dataset(ds_cfg: Dict[str, Any]):
     raise ValueError(f"Failed to load dataset {path}")
 
 
-def load_examples(cfg: Dict[str, Any]) -> List[TaskExample]:
-    """Load and normalize examples according to eval_config.yaml."""
+def _iter_streaming(
+    ds_cfg: Dict[str, Any], per_limit: Optional[int], seed: int
+) -> Iterator[TaskExample]:
+    """Yield examples from a streamed dataset without materializing it."""
+    ds = _load_hf_dataset(ds_cfg, streaming=True)
+    adapt = make_adapter(ds_cfg, getattr(ds, "features", None))
+    if per_limit is not None:
+        # Approximate sampling: shuffle within a bounded buffer, then take the budget.
+        buffer_size = int(ds_cfg.get("shuffle_buffer", 10_000))
+        ds = ds.shuffle(seed=seed, buffer_size=buffer_size).take(per_limit)
+    for local_idx, ex in enumerate(ds):
+        adapted = adapt(ex, local_idx)
+        if adapted is not None:
+            yield adapted
+
+
+def iter_examples(cfg: Dict[str, Any], rng: Optional[random.Random] = None) -> Iterator[TaskExample]:
+    """Lazily yield normalized examples, applying the per-dataset sampling budget."""
     datasets_cfg = cfg.get("datasets", [])
     if not datasets_cfg:
         raise ValueError("No datasets configured in eval_config.yaml")
@@ -41,9 +57,8 @@ def load_examples(cfg: Dict[str, Any]) -> List[TaskExample]:
     seed = int(cfg.get("seed", 42))
     max_samples = cfg.get("max_samples")
     max_per_ds = cfg.get("max_samples_per_dataset")
-
-    rng = random.Random(seed)
-    examples: List[TaskExample] = []
+    if rng is None:
+        rng = random.Random(seed)
 
     # Compute per-dataset sampling budget when not explicitly set.
     per_limit = None
@@ -55,25 +70,33 @@ def load_examples(cfg: Dict[str, Any]) -> List[TaskExample]:
     for ds_cfg in datasets_cfg:
         if ds_cfg.get("enabled", True) is False:
             continue
+        if ds_cfg.get("streaming", False):
+            yield from _iter_streaming(ds_cfg, per_limit, seed)
+            continue
         ds = _load_hf_dataset(ds_cfg)
         ds_len = len(ds)
 
-        # Sample deterministically to keep runs reproducible.
-        if per_limit is None or per_limit >= ds_len:
-            indices = list(range(ds_len))
-        else:
-            indices = rng.sample(range(ds_len), per_limit)
-
-        # Preserve deterministic ordering across Python versions.
-        indices = list(indices)
-        indices.sort()
+        # Sample deterministically to keep runs reproducible; sorted indices keep
+        # dataset order, and select() gathers them in one Arrow call.
+        if per_limit is not None and per_limit < ds_len:
+            ds = ds.select(sorted(rng.sample(range(ds_len), per_limit)))
 
-        for local_idx, idx in enumerate(indices):
-            ex = ds[int(idx)]
-            adapted = adapt_example(ex, local_idx, ds_cfg, features=getattr(ds, "features", None))
+        adapt = make_adapter(ds_cfg, getattr(ds, "features", None))
+        for local_idx, ex in enumerate(ds):
+            adapted = adapt(ex, local_idx)
             if adapted is None:
                 continue
-            examples.append(adapted)
+            yield adapted
+
+
+def load_examples(cfg: Dict[str, Any]) -> List[TaskExample]:
+    """Load and normalize examples according to eval_config.yaml."""
+    seed = int(cfg.get("seed", 42))
+    max_samples = cfg.get("max_samples")
+
+    # Share one RNG with iter_examples so sampling matches a single-pass load.
+    rng = random.Random(seed)
+    examples = list(iter_examples(cfg, rng=rng))
 
     # Apply a final truncation if total examples exceed the limit.
     if max_samples is not None and len(examples) > int(max_samples):
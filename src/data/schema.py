@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskExample:
     """Normalized example record shared by loaders, models, and evaluators."""
 
@@ -20,8 +20,15 @@ class TaskExample:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert the dataclass to a JSON-serializable dictionary."""
-        data = asdict(self)
-        # Always materialize meta to simplify downstream code.
-        if self.meta is None:
-            data["meta"] = {}
-        return data
+        # Explicit fields avoid asdict's recursive deep copy; containers are
+        # copied one level so callers cannot mutate the example through the dict.
+        return {
+            "id": self.id,
+            "task_type": self.task_type,
+            "question": self.question,
+            "label": self.label,
+            "choices": list(self.choices) if self.choices is not None else None,
+            "context": self.context,
+            # Always materialize meta to simplify downstream code.
+            "meta": dict(self.meta) if self.meta is not None else {},
+        }
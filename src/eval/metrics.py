@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import operator
+from typing import Any, Dict, List
+
+import numpy as np
 
 
 def accuracy(y_true: List[str], y_pred: List[str]) -> float:
     """Compute accuracy as correct / total."""
     if not y_true:
         return 0.0
-    correct = sum(1 for t, p in zip(y_true, y_pred) if t == p)
+    # map(operator.eq, ...) compares pairwise in C without a generator frame.
+    correct = sum(map(operator.eq, y_true, y_pred))
     return correct / len(y_true)
 
 
@@ -18,31 +22,48 @@ def macro_f1(y_true: List[str], y_pred: List[str]) -> float:
     labels = sorted(set(y_true) | set(y_pred))
     if not labels:
         return 0.0
-    f1s = []
-    for label in labels:
-        tp = sum(1 for t, p in zip(y_true, y_pred) if t == label and p == label)
-        fp = sum(1 for t, p in zip(y_true, y_pred) if t != label and p == label)
-        fn = sum(1 for t, p in zip(y_true, y_pred) if t == label and p != label)
-        if tp == 0 and fp == 0 and fn == 0:
-            f1s.append(0.0)
-            continue
-        precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-        recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-        if precision + recall == 0:
-            f1s.append(0.0)
-        else:
-            f1s.append(2 * precision * recall / (precision + recall))
-    return sum(f1s) / len(f1s)
-
-
-def compute_metrics(records: List[Dict[str, str]]) -> Dict[str, float]:
+    index = {label: i for i, label in enumerate(labels)}
+    n = min(len(y_true), len(y_pred))
+    t_idx = np.fromiter((index[t] for t in y_true[:n]), dtype=np.intp, count=n)
+    p_idx = np.fromiter((index[p] for p in y_pred[:n]), dtype=np.intp, count=n)
+
+    # Confusion matrix: rows are gold labels, columns are predictions.
+    cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    np.add.at(cm, (t_idx, p_idx), 1)
+    return _macro_f1_from_confusion(cm)
+
+
+def _macro_f1_from_confusion(cm: np.ndarray) -> float:
+    """Average per-label F1 from a square confusion matrix."""
+    tp = np.diag(cm).astype(np.float64)
+    fp = cm.sum(axis=0) - tp
+    fn = cm.sum(axis=1) - tp
+    precision = np.divide(tp, tp + fp, out=np.zeros_like(tp), where=(tp + fp) > 0)
+    recall = np.divide(tp, tp + fn, out=np.zeros_like(tp), where=(tp + fn) > 0)
+    denom = precision + recall
+    f1 = np.divide(2 * precision * recall, denom, out=np.zeros_like(tp), where=denom > 0)
+    return float(f1.mean())
+
+
+def compute_metrics(records: List[Dict[str, Any]]) -> Dict[str, float]:
     """Compute summary metrics from a list of prediction records."""
+    n = len(records)
     y_true = [r["label"] for r in records]
     y_pred = [r["prediction"] for r in records]
-    invalid = sum(1 for p in y_pred if p == "INVALID")
+    # Final-only fallback answers come from one direct call, not a full agent session,
+    # so they are counted separately and excluded from the session-only accuracy.
+    session = [not (r.get("meta") or {}).get("final_only_retry") for r in records]
+    n_final_only = n - sum(session)
+    if n_final_only:
+        session_true = [t for t, keep in zip(y_true, session) if keep]
+        session_pred = [p for p, keep in zip(y_pred, session) if keep]
+    else:
+        session_true, session_pred = y_true, y_pred
     return {
         "accuracy": accuracy(y_true, y_pred),
         "macro_f1": macro_f1(y_true, y_pred),
-        "n": len(records),
-        "invalid_rate": invalid / len(records) if records else 0.0,
+        "n": n,
+        "invalid_rate": y_pred.count("INVALID") / n if n else 0.0,
+        "final_only_rate": n_final_only / n if n else 0.0,
+        "accuracy_excl_final_only": accuracy(session_true, session_pred),
     }
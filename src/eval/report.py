@@ -4,10 +4,15 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
+import numpy as np
+
+# Collapse line breaks and tabs to spaces in a single C-level pass.
+_WHITESPACE_TO_SPACE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
 
 def _truncate(text: str, limit: int = 160) -> str:
     """Shorten long text blocks for report tables."""
-    text = text.replace("\n", " ").strip()
+    text = text.translate(_WHITESPACE_TO_SPACE).strip()
     return text if len(text) <= limit else text[: limit - 3] + "..."
 
 
@@ -16,6 +21,14 @@ def _index_records(records: List[Dict]) -> Dict[str, Dict]:
     return {r["id"]: r for r in records}
 
 
+def _format_error_row(b: Dict, a: Dict) -> str:
+    """Render one baseline/agent disagreement as a Markdown bullet."""
+    return (
+        f"- {b['id']}: {_truncate(b['question'])} | gold={b['label']} | "
+        f"baseline={b['prediction']} | agent={a['prediction']}"
+    )
+
+
 def generate_compare_report(
     baseline_records: List[Dict],
     agent_records: List[Dict],
@@ -43,6 +56,18 @@ def generate_compare_report(
                 f"| {name} | {met['accuracy']:.4f} | {met['macro_f1']:.4f} | {met['invalid_rate']:.4f} | {met['n']} |"
             )
 
+    # Agent answers recovered by a single direct Final call are reported separately.
+    agent_systems = [("Agent", metrics_agent)] + list((metrics_ablation or {}).items())
+    fallback_lines = [
+        f"- {name}: {met['final_only_rate'] * 100:.1f}% of answers came from the final-only "
+        f"fallback; accuracy without them: {met['accuracy_excl_final_only']:.4f}"
+        for name, met in agent_systems
+        if met.get("final_only_rate")
+    ]
+    if fallback_lines:
+        lines.append("\n## Final-Only Fallback\n")
+        lines.extend(fallback_lines)
+
     acc_delta = (metrics_agent["accuracy"] - metrics_baseline["accuracy"]) * 100
     f1_delta = (metrics_agent["macro_f1"] - metrics_baseline["macro_f1"]) * 100
     lines.append("\n## Absolute Improvement (Agent - Baseline)\n")
@@ -53,28 +78,19 @@ def generate_compare_report(
     base_idx = _index_records(baseline_records)
     agent_idx = _index_records(agent_records)
 
-    base_wrong_agent_right = []
-    base_right_agent_wrong = []
-
-    for ex_id, b in base_idx.items():
-        a = agent_idx.get(ex_id)
-        if not a:
-            continue
-        if (not b["correct"]) and a["correct"]:
-            base_wrong_agent_right.append((b, a))
-        if b["correct"] and (not a["correct"]):
-            base_right_agent_wrong.append((b, a))
+    # Pair up records present in both runs as parallel arrays.
+    pairs = [(b, agent_idx[ex_id]) for ex_id, b in base_idx.items() if ex_id in agent_idx]
+    b_correct = np.fromiter((bool(b["correct"]) for b, _ in pairs), dtype=bool, count=len(pairs))
+    a_correct = np.fromiter((bool(a["correct"]) for _, a in pairs), dtype=bool, count=len(pairs))
+    base_wrong_agent_right = np.flatnonzero(~b_correct & a_correct)[:10]
+    base_right_agent_wrong = np.flatnonzero(b_correct & ~a_correct)[:10]
 
     lines.append("\n### Top-10: Baseline Wrong / Agent Correct\n")
-    for b, a in base_wrong_agent_right[:10]:
-        lines.append(
-            f"- {b['id']}: {_truncate(b['question'])} | gold={b['label']} | baseline={b['prediction']} | agent={a['prediction']}"
-        )
+    for i in base_wrong_agent_right:
+        lines.append(_format_error_row(*pairs[i]))
 
     lines.append("\n### Top-10: Baseline Correct / Agent Wrong\n")
-    for b, a in base_right_agent_wrong[:10]:
-        lines.append(
-            f"- {b['id']}: {_truncate(b['question'])} | gold={b['label']} | baseline={b['prediction']} | agent={a['prediction']}"
-        )
+    for i in base_right_agent_wrong:
+        lines.append(_format_error_row(*pairs[i]))
 
     return "\n".join(lines) + "\n"
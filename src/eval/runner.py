@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
+import yaml
 from tqdm import tqdm
 
 from data.loader import load_examples
@@ -15,22 +16,32 @@ from eval.metrics import compute_metrics
 from eval.report import generate_compare_report
 from llm.providers import load_provider_config, make_autogen_config, make_openai_client
 from systems import baseline_direct, finrobot_agent
-from utils.cache import DiskCache
-from utils.log import setup_logger
+from utils.cache import open_cache
+from utils.jsonio import dumps_bytes
+from utils.log import flush_logger, setup_logger
 from utils.seed import set_seed
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeDumper
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
 
 def _write_json(path: str, data: Dict[str, Any]) -> None:
     """Write a JSON file with deterministic formatting."""
-    with open(path, "w") as f:
-        json.dump(data, f, ensure_ascii=True, indent=2)
+    with open(path, "wb") as f:
+        f.write(dumps_bytes(data, indent=True))
 
 
 def _write_jsonl(path: str, records: List[Dict[str, Any]]) -> None:
     """Write a JSONL file where each line is a single record."""
-    with open(path, "w") as f:
+    # A 1 MiB buffer turns per-line writes into a handful of syscalls.
+    with open(path, "wb", buffering=1 << 20) as f:
         for rec in records:
-            f.write(json.dumps(rec, ensure_ascii=True) + "\n")
+            f.write(dumps_bytes(rec))
+            f.write(b"\n")
 
 
 def _slugify(text: str, max_len: int = 80) -> str:
@@ -39,13 +50,36 @@ def _slugify(text: str, max_len: int = 80) -> str:
         return "run"
     text = text.strip().lower()
     text = text.replace(os.sep, "-")
-    text = re.sub(r"[^a-z0-9]+", "-", text)
+    text = _SLUG_RE.sub("-", text)
     text = text.strip("-")
     if not text:
         text = "run"
     return text[:max_len]
 
 
+def _run_batches(
+    func: Callable[[List[Any]], List[Dict[str, Any]]],
+    examples: List[Any],
+    batch_size: int,
+    desc: str,
+) -> List[Dict[str, Any]]:
+    """Feed examples to func in fixed-size chunks and concatenate the results."""
+    outputs: List[Dict[str, Any]] = []
+    # Throttle redraws so warm-cache passes are not dominated by progress output.
+    with tqdm(
+        total=len(examples),
+        desc=desc,
+        mininterval=0.5,
+        miniters=max(1, len(examples) // 200),
+        smoothing=0.05,
+    ) as bar:
+        for start in range(0, len(examples), batch_size):
+            chunk = examples[start : start + batch_size]
+            outputs.extend(func(chunk))
+            bar.update(len(chunk))
+    return outputs
+
+
 def _write_run_readme(path: str, cfg: Dict[str, Any], run_id: str, n_examples: int) -> None:
     """Write a Markdown summary of the run configuration and datasets."""
     lines: List[str] = []
@@ -64,6 +98,10 @@ def _write_run_readme(path: str, cfg: Dict[str, Any], run_id: str, n_examples: i
     lines.append(f"- max_samples_per_dataset: {cfg.get('max_samples_per_dataset')}")
     lines.append(f"- total_examples_loaded: {n_examples}")
     lines.append(f"- use_cache: {cfg.get('use_cache', True)}")
+    lines.append(f"- cache_backend: {cfg.get('cache_backend', 'sqlite')}")
+    lines.append(f"- cache_dir: {cfg.get('cache_dir') or '(run directory)'}")
+    lines.append(f"- concurrency: {cfg.get('concurrency', 16)}")
+    lines.append(f"- batch_size: {cfg.get('batch_size', 32)}")
     lines.append("")
     lines.append("## Datasets")
     datasets = cfg.get("datasets", []) or []
@@ -145,86 +183,125 @@ def run_eval(cfg: Dict[str, Any]) -> str:
 
     # Snapshot the effective config for reproducibility.
     with open(os.path.join(run_dir, "config_snapshot.yaml"), "w") as f:
-        import yaml
-
-        yaml.safe_dump(cfg, f, sort_keys=False)
+        yaml.dump(cfg, f, Dumper=SafeDumper, sort_keys=False)
     _write_run_readme(os.path.join(run_dir, "README.md"), cfg, run_id, len(examples))
 
-    use_cache = bool(cfg.get("use_cache", True))
+    temperature = cfg.get("temperature", 0.0)
+    # One cache for every system; keys are namespaced per system. Pointing
+    # cache_dir at a shared directory lets later runs reuse stored samples.
+    cache = open_cache(
+        cfg.get("cache_dir") or run_dir,
+        enabled=bool(cfg.get("use_cache", True)),
+        backend=cfg.get("cache_backend", "sqlite"),
+        resample=float(temperature) > 0,
+    )
+
+    finrobot_cfg = cfg.get("finrobot", {})
+    if provider_cfg.provider == "manual":
+        finrobot_cfg = {**finrobot_cfg, "manual_mode": True}
+        logger.info("Manual mode enabled for FinRobot agent.")
+
+    # Interactive runs read from stdin, so they must stay strictly sequential.
+    concurrency = int(cfg.get("concurrency", 16))
+    if finrobot_cfg.get("manual_mode", False):
+        concurrency = 1
+    batch_size = max(1, int(cfg.get("batch_size", 32)))
+    logger.info("Concurrency: %d | batch_size: %d", concurrency, batch_size)
+
+    try:
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        metrics: Dict[str, Dict[str, Any]] = {}
 
-    results: Dict[str, List[Dict[str, Any]]] = {}
-    metrics: Dict[str, Dict[str, Any]] = {}
+        if cfg.get("run_baseline", True):
+            logger.info("Running baseline...")
 
-    if cfg.get("run_baseline", True):
-        logger.info("Running baseline...")
-        cache = DiskCache(os.path.join(run_dir, "cache_baseline.json")) if use_cache else None
-        outputs = []
-        for ex in tqdm(examples, desc="baseline"):
-            outputs.append(
-                baseline_direct.run_baseline(
-                    [ex],
+            def _baseline_chunk(chunk):
+                """Run the baseline on one chunk of examples."""
+                return baseline_direct.run_baseline(
+                    chunk,
                     client,
                     provider_cfg.model,
-                    cfg.get("temperature", 0.0),
+                    temperature,
                     cache=cache,
-                )[0]
-            )
-        results["baseline"] = outputs
-        metrics["baseline"] = compute_metrics(outputs)
-        _write_jsonl(os.path.join(run_dir, "baseline.jsonl"), outputs)
-        _write_json(os.path.join(run_dir, "metrics_baseline.json"), metrics["baseline"])
+                    cache_ns="baseline",
+                    concurrency=concurrency,
+                )
 
-    finrobot_cfg = cfg.get("finrobot", {})
-    if provider_cfg.provider == "manual":
-        finrobot_cfg = {**finrobot_cfg, "manual_mode": True}
-        logger.info("Manual mode enabled for FinRobot agent.")
+            outputs = _run_batches(_baseline_chunk, examples, batch_size, "baseline")
+            results["baseline"] = outputs
+            metrics["baseline"] = compute_metrics(outputs)
+            _write_jsonl(os.path.join(run_dir, "baseline.jsonl"), outputs)
+            _write_json(os.path.join(run_dir, "metrics_baseline.json"), metrics["baseline"])
+
+        def _agent_pass(name: str, no_critic: bool) -> List[Dict[str, Any]]:
+            """Run the FinRobot agent (or an ablation of it) over all examples."""
+            # One runner and one worker pool per pass: toolkit selection happens once, and
+            # the runner's per-thread groups survive across batches on the same threads.
+            runner = finrobot_agent.FinRobotAgentRunner(
+                llm_config=llm_config,
+                temperature=temperature,
+                no_critic=no_critic,
+                finrobot_config=finrobot_cfg,
+                client=client,
+            )
 
-    if cfg.get("run_agent", True):
-        logger.info("Running FinRobot agent...")
-        cache = DiskCache(os.path.join(run_dir, "cache_agent.json")) if use_cache else None
-        outputs = []
-        for ex in tqdm(examples, desc="agent"):
-            outputs.append(
-                finrobot_agent.run_agent(
-                    [ex],
+            def _agent_chunk(chunk):
+                """Run the agent on one chunk of examples."""
+                return finrobot_agent.run_agent(
+                    chunk,
                     llm_config,
-                    cfg.get("temperature", 0.0),
-                    no_critic=False,
+                    temperature,
+                    no_critic=no_critic,
                     cache=cache,
+                    cache_ns=name,
                     finrobot_config=finrobot_cfg,
-                )[0]
-            )
-        results["agent"] = outputs
-        metrics["agent"] = compute_metrics(outputs)
-        _write_jsonl(os.path.join(run_dir, "agent.jsonl"), outputs)
-        _write_json(os.path.join(run_dir, "metrics_agent.json"), metrics["agent"])
+                    concurrency=concurrency,
+                    client=client,
+                    runner=runner,
+                    executor=pool,
+                )
 
-    # Optional ablations to isolate architectural contributions.
-    ablations = cfg.get("ablations", []) or []
-    metrics_ablation: Dict[str, Dict[str, Any]] = {}
-    for ab in ablations:
-        if ab == "agent_no_critic":
-            logger.info("Running ablation: agent_no_critic...")
-            cache = DiskCache(os.path.join(run_dir, "cache_agent_no_critic.json")) if use_cache else None
-            outputs = []
-            for ex in tqdm(examples, desc="agent_no_critic"):
-                outputs.append(
-                    finrobot_agent.run_agent(
-                        [ex],
-                        llm_config,
-                        cfg.get("temperature", 0.0),
-                        no_critic=True,
-                        cache=cache,
-                        finrobot_config=finrobot_cfg,
-                    )[0]
+            pool = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+            try:
+                return _run_batches(_agent_chunk, examples, batch_size, name)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+
+        if cfg.get("run_agent", True):
+            logger.info("Running FinRobot agent...")
+            outputs = _agent_pass("agent", False)
+            results["agent"] = outputs
+            metrics["agent"] = compute_metrics(outputs)
+            _write_jsonl(os.path.join(run_dir, "agent.jsonl"), outputs)
+            _write_json(os.path.join(run_dir, "metrics_agent.json"), metrics["agent"])
+
+        # Optional ablations to isolate architectural contributions.
+        ablations = cfg.get("ablations", []) or []
+        metrics_ablation: Dict[str, Dict[str, Any]] = {}
+        for ab in ablations:
+            if ab == "agent_no_critic":
+                logger.info("Running ablation: agent_no_critic...")
+                outputs = _agent_pass("agent_no_critic", True)
+                results["agent_no_critic"] = outputs
+                metrics_ablation["agent_no_critic"] = compute_metrics(outputs)
+                _write_jsonl(os.path.join(run_dir, "agent_no_critic.jsonl"), outputs)
+                _write_json(
+                    os.path.join(run_dir, "metrics_agent_no_critic.json"),
+                    metrics_ablation["agent_no_critic"],
                 )
-            results["agent_no_critic"] = outputs
-            metrics_ablation["agent_no_critic"] = compute_metrics(outputs)
-            _write_jsonl(os.path.join(run_dir, "agent_no_critic.jsonl"), outputs)
-            _write_json(
-                os.path.join(run_dir, "metrics_agent_no_critic.json"),
-                metrics_ablation["agent_no_critic"],
-            )
+    finally:
+        # Always persist cached responses and release connections, even on errors or
+        # Ctrl-C; the SQLite backend only commits every few writes.
+        try:
+            if cache is not None:
+                cache.close()
+        finally:
+            close_client = getattr(client, "close", None)
+            if close_client is not None:
+                close_client()
+            # run.log is buffered; make it complete now rather than at process exit.
+            flush_logger(logger)
 
     # Produce a comparison report if both baseline and agent exist.
     if "baseline" in results and "agent" in results:
@@ -239,4 +316,5 @@ def run_eval(cfg: Dict[str, Any]) -> str:
             f.write(report)
 
     logger.info("Run complete. Outputs saved to %s", run_dir)
+    flush_logger(logger)
     return run_dir
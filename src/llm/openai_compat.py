@@ -2,18 +2,77 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
 import sys
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+MAX_ATTEMPTS = 5
+MAX_RETRY_DELAY = 30.0
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Return the server-requested wait from a Retry-After header, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_DELAY)
+    except ValueError:
+        # HTTP-date form; fall back to our own backoff.
+        return None
+
+
+def _backoff_wait(exc: BaseException, delay: float) -> float:
+    """Return how long to sleep before the next attempt."""
+    # Honour Retry-After; otherwise jitter so parallel workers do not retry in lockstep.
+    wait = _retry_after_seconds(exc)
+    if wait is None:
+        wait = delay * random.uniform(0.5, 1.5)
+    return wait
+
+
+def _make_http_client(
+    timeout: int, max_connections: int = 64, use_async: bool = False
+) -> Optional[Any]:
+    """Build a pooled HTTP/2 transport for the SDK, or None to keep its default."""
+    try:
+        import h2  # noqa: F401
+        import httpx
+        from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+        client_cls = DefaultAsyncHttpxClient if use_async else DefaultHttpxClient
+        return client_cls(
+            http2=True,
+            timeout=timeout,
+            # Keep every connection alive so each in-flight worker reuses its TLS session.
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+    except Exception:
+        # Without httpx[http2] the SDK's own HTTP/1.1 keep-alive pool is used.
+        return None
 
 
 class OpenAICompatClient:
     """Thin wrapper around the OpenAI SDK using a custom base_url."""
 
-    def __init__(self, base_url: str, api_key: str, timeout: int = 60):
+    def __init__(self, base_url: str, api_key: str, timeout: int = 60, max_connections: int = 64):
         """Initialize an OpenAI-compatible client with custom base_url."""
         self.base_url = base_url
         self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._async_client: Optional[Any] = None
+        # The async pool is bound to the loop it was opened on, so keep one loop for the run.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         try:
             from openai import OpenAI
             import openai as openai_errors
@@ -21,7 +80,12 @@ class OpenAICompatClient:
             raise ImportError(
                 "OpenAI SDK is required. Install with `pip install openai`."
             ) from exc
-        self.client = OpenAI(base_url=base_url, api_key=api_key, timeout=timeout)
+        self.client = OpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=timeout,
+            http_client=_make_http_client(timeout, max_connections),
+        )
         self._retry_exceptions = (
             openai_errors.APIConnectionError,
             openai_errors.APITimeoutError,
@@ -52,15 +116,75 @@ class OpenAICompatClient:
                     **kwargs,
                 )
                 break
-            except self._retry_exceptions:
+            except self._retry_exceptions as exc:
                 attempts += 1
-                if attempts >= 3:
+                if attempts >= MAX_ATTEMPTS:
                     raise
-                time.sleep(delay)
-                delay *= 2
+                time.sleep(_backoff_wait(exc, delay))
+                delay = min(delay * 2, MAX_RETRY_DELAY)
         content = resp.choices[0].message.content if resp.choices else ""
         return content or "", resp
 
+    async def achat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Tuple[str, Any]:
+        """Async variant of chat; call aclose() before the event loop shuts down."""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+
+            self._async_client = AsyncOpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key,
+                timeout=self.timeout,
+                http_client=_make_http_client(self.timeout, self.max_connections, use_async=True),
+            )
+        attempts = 0
+        delay = 1.0
+        while True:
+            try:
+                resp = await self._async_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                )
+                break
+            except self._retry_exceptions as exc:
+                attempts += 1
+                if attempts >= MAX_ATTEMPTS:
+                    raise
+                await asyncio.sleep(_backoff_wait(exc, delay))
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+        content = resp.choices[0].message.content if resp.choices else ""
+        return content or "", resp
+
+    async def aclose(self) -> None:
+        """Close the async connection pool, which is bound to the current event loop."""
+        if self._async_client is not None:
+            client, self._async_client = self._async_client, None
+            await client.close()
+
+    def run_async(self, coro: Awaitable[T]) -> T:
+        """Run coro on this client's long-lived event loop, keeping async connections warm."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections and the async loop, if one was started."""
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.run_until_complete(self.aclose())
+            finally:
+                self._loop.close()
+        self.client.close()
+
 
 def _read_multiline() -> str:
     """Collect multiple lines from stdin until a sentinel line is received."""
@@ -106,3 +230,6 @@ class ManualClient:
         if not response:
             print("[MANUAL MODE] Empty response received.", file=sys.stderr)
         return response, {"manual": True}
+
+    def close(self) -> None:
+        """No-op: the manual client holds no connections."""
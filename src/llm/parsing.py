@@ -3,22 +3,99 @@
 from __future__ import annotations
 
 import re
-from typing import List, Optional
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
 
 LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
+# Label sets larger than this are matched through the Aho-Corasick automaton.
+_LABEL_AUTOMATON_MIN = 8
+
+# Compiled once so the per-response parsing path skips re's pattern cache.
+_FENCE_OPEN = re.compile(r"^```[a-zA-Z0-9]*\n?")
+_MARK_LOOSE = re.compile(r"(?:FINAL|ANSWER)\s*[:\-]?\s*([A-Z])\b")
+_MARK_STRICT = re.compile(r"(?:FINAL ANSWER|FINAL|ANSWER|CHOICE)\s*[:\-]?\s*([A-Z])\b")
+_LETTER_TOK = re.compile(r"\b([A-Z])\b")
+# A line (split on the same boundaries as str.splitlines) holding exactly one A-Z letter.
+_LINE_BREAKS = r"\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029"
+_STRICT_LINE = re.compile(
+    rf"(?:^|(?<=[{_LINE_BREAKS}]))[^A-Z{_LINE_BREAKS}]*([A-Z])[^A-Z{_LINE_BREAKS}]*(?=[{_LINE_BREAKS}]|\Z)"
+)
+
 
 def _strip_fences(text: str) -> str:
-    """Remove Markdown code fences so parsing is more robust."""
+    """Remove Markdown code fences and surrounding whitespace so parsing is more robust."""
     if not text:
         return ""
+    # Most answers carry no fence at all, so skip the regex work entirely.
+    if "```" not in text:
+        return text.strip()
     text = text.strip()
     if text.startswith("```"):
-        text = re.sub(r"^```[a-zA-Z0-9]*\n?", "", text)
-        text = re.sub(r"```$", "", text).strip()
+        text = _FENCE_OPEN.sub("", text, count=1)
+        text = text.removesuffix("```").strip()
     return text
 
 
+@lru_cache(maxsize=32)
+def _allowed_letters(n: int) -> FrozenSet[str]:
+    """Return the answer letters valid for n choices (all letters when n is 0)."""
+    return frozenset(LETTERS[:n] if n else LETTERS)
+
+
+@lru_cache(maxsize=512)
+def _folded_choices(choices: Tuple[str, ...]) -> Tuple[Tuple[int, str], ...]:
+    """Casefold each non-empty choice once, keeping the first index of duplicates."""
+    seen = set()
+    folded = []
+    for i, choice in enumerate(choices):
+        if not choice:
+            continue
+        key = choice.casefold()
+        if key not in seen:
+            seen.add(key)
+            folded.append((i, key))
+    return tuple(folded)
+
+
+@lru_cache(maxsize=512)
+def _choice_automaton(choices: Tuple[str, ...]):
+    """Build an Aho-Corasick automaton mapping casefolded choices to their first index."""
+    folded = _folded_choices(choices)
+    if not folded:
+        return None
+    automaton = ahocorasick.Automaton()
+    for i, key in folded:
+        automaton.add_word(key, i)
+    automaton.make_automaton()
+    return automaton
+
+
+def _match_choice_text(folded_text: str, choices: Tuple[str, ...]) -> Optional[int]:
+    """Return the lowest index whose choice text occurs in already-casefolded text."""
+    if ahocorasick is None:
+        for i, key in _folded_choices(choices):
+            if key in folded_text:
+                return i
+        return None
+    automaton = _choice_automaton(choices)
+    if automaton is None:
+        return None
+    # One linear pass finds every choice; the lowest index wins as before.
+    best = None
+    for _, i in automaton.iter(folded_text):
+        if best is None or i < best:
+            best = i
+            if best == 0:
+                break
+    return best
+
+
 def extract_choice(text: str, choices: Optional[List[str]] = None) -> Optional[str]:
     """Extract a multiple-choice letter from a free-form response."""
     if not text:
@@ -27,26 +104,26 @@ def extract_choice(text: str, choices: Optional[List[str]] = None) -> Optional[s
     upper = text.upper()
 
     # Compute the allowed letter set from the choices if provided.
-    allowed_letters = list(LETTERS[: len(choices)]) if choices else list(LETTERS)
+    allowed_letters = _allowed_letters(len(choices) if choices else 0)
 
     # Look for explicit markers like "FINAL: A" or "ANSWER: B".
-    m = re.search(r"(?:FINAL|ANSWER)\s*[:\-]?\s*([A-Z])\b", upper)
+    m = _MARK_LOOSE.search(upper)
     if m:
         letter = m.group(1)
         if letter in allowed_letters:
             return letter
 
     # Fallback to any isolated letter token in the output.
-    matches = re.findall(r"\b([A-Z])\b", upper)
+    matches = _LETTER_TOK.findall(upper)
     for letter in matches:
         if letter in allowed_letters:
             return letter
 
     # As a final fallback, match choice text in the output.
     if choices:
-        for i, choice in enumerate(choices):
-            if choice and choice.lower() in text.lower():
-                return LETTERS[i] if i < len(LETTERS) else str(i)
+        i = _match_choice_text(text.casefold(), tuple(choices))
+        if i is not None:
+            return LETTERS[i] if i < len(LETTERS) else str(i)
     return None
 
 
@@ -54,35 +131,45 @@ def extract_choice_strict(text: str, choices: Optional[List[str]] = None) -> Opt
     """Extract a multiple-choice letter with stricter formatting rules."""
     if not text:
         return None
-    text = _strip_fences(text).strip()
+    text = _strip_fences(text)
     upper = text.upper()
 
-    allowed_letters = list(LETTERS[: len(choices)]) if choices else list(LETTERS)
+    allowed_letters = _allowed_letters(len(choices) if choices else 0)
 
     # Prefer explicit markers to avoid accidental matches.
-    m = re.search(r"(?:FINAL ANSWER|FINAL|ANSWER|CHOICE)\s*[:\-]?\s*([A-Z])\b", upper)
+    m = _MARK_STRICT.search(upper)
     if m:
         letter = m.group(1)
         if letter in allowed_letters:
             return letter
 
     # Accept lines that reduce to exactly one allowed letter.
-    for line in upper.splitlines():
-        cleaned = re.sub(r"[^A-Z]", "", line.strip())
-        if len(cleaned) == 1 and cleaned in allowed_letters:
-            return cleaned
+    for m in _STRICT_LINE.finditer(upper):
+        if m.group(1) in allowed_letters:
+            return m.group(1)
     return None
 
 
+@lru_cache(maxsize=256)
+def _prep_labels(labels: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """Casefold labels once, longest first so "very positive" wins over "positive"."""
+    pairs = [(label.casefold(), label) for label in labels if label]
+    return tuple(sorted(pairs, key=lambda pair: -len(pair[0])))
+
+
 def extract_label(text: str, label_set: Optional[List[str]] = None) -> Optional[str]:
     """Extract a label from text, optionally constrained by a label set."""
     if not text:
         return None
-    text = _strip_fences(text).strip()
+    text = _strip_fences(text)
     if not label_set:
         return text
-    lower = text.lower()
-    for label in label_set:
-        if label.lower() in lower:
+    prepped = _prep_labels(tuple(label_set))
+    folded = text.casefold()
+    if ahocorasick is not None and len(prepped) > _LABEL_AUTOMATON_MIN:
+        i = _match_choice_text(folded, tuple(key for key, _ in prepped))
+        return prepped[i][1] if i is not None else None
+    for key, label in prepped:
+        if key in folded:
             return label
     return None
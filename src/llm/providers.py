@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict
 
 from .openai_compat import ManualClient, OpenAICompatClient
@@ -17,6 +18,8 @@ class ProviderConfig:
     base_url: str
     api_key: str
     model: str
+    # Size of the shared HTTP connection pool; matches the number of in-flight examples.
+    max_connections: int = 16
 
 
 def load_provider_config(cfg: Dict[str, Any]) -> ProviderConfig:
@@ -48,30 +51,40 @@ def load_provider_config(cfg: Dict[str, Any]) -> ProviderConfig:
     if not model:
         raise ValueError("Model name must be specified in config")
 
-    return ProviderConfig(provider=provider, base_url=base_url, api_key=api_key, model=model)
+    return ProviderConfig(
+        provider=provider,
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        max_connections=max(1, int(cfg.get("concurrency", 16))),
+    )
 
 
 def make_openai_client(pcfg: ProviderConfig, timeout: int = 60) -> OpenAICompatClient:
-    """Create a compatible client (manual or OpenAI SDK)."""
+    """Create a compatible client (manual or OpenAI SDK); build it once and share it per run."""
     if pcfg.provider == "manual":
         return ManualClient(base_url=pcfg.base_url, api_key=pcfg.api_key, timeout=timeout)
-    return OpenAICompatClient(base_url=pcfg.base_url, api_key=pcfg.api_key, timeout=timeout)
+    return OpenAICompatClient(
+        base_url=pcfg.base_url,
+        api_key=pcfg.api_key,
+        timeout=timeout,
+        max_connections=pcfg.max_connections,
+    )
+
+
+@lru_cache(maxsize=8)
+def _config_entry_template(model: str, api_key: str, base_url: str) -> Dict[str, str]:
+    """Return the shared config_list entry for one provider endpoint."""
+    return {"model": model, "api_key": api_key, "base_url": base_url}
 
 
 def make_autogen_config(
     pcfg: ProviderConfig, temperature: float = 0.0, max_tokens: int | None = None
 ) -> Dict[str, Any]:
     """Build an AutoGen LLM config from the resolved provider settings."""
-    config = {
-        "config_list": [
-            {
-                "model": pcfg.model,
-                "api_key": pcfg.api_key,
-                "base_url": pcfg.base_url,
-            }
-        ],
-        "temperature": temperature,
-    }
+    entry = _config_entry_template(pcfg.model, pcfg.api_key, pcfg.base_url)
+    # Hand out a shallow copy so callers (and AutoGen) can mutate it freely.
+    config = {"config_list": [dict(entry)], "temperature": temperature}
     if max_tokens is not None:
         config["max_tokens"] = max_tokens
     return config
@@ -2,45 +2,44 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
 from data.schema import TaskExample
 from llm.openai_compat import OpenAICompatClient
 from llm.parsing import extract_choice, extract_label
-from systems.prompts import BASELINE_SYSTEM, build_user_prompt
-from utils.cache import DiskCache, make_cache_key
+from systems.prompts import BASELINE_SYSTEM, PROMPT_FINGERPRINT, build_user_prompt
+from utils.cache import SampleCache, make_cache_key
+from utils.parallel import ordered_map
 
 
-def _predict_one(
-    example: TaskExample,
-    client: OpenAICompatClient,
-    model: str,
-    temperature: float,
-    cache: Optional[DiskCache] = None,
-) -> Dict[str, Any]:
-    """Run a single-shot prediction with optional caching."""
-    user_prompt = build_user_prompt(example.question, example.choices, example.context)
-    messages = [
+def _cache_key(example: TaskExample, model: str, temperature: float, cache_ns: str) -> str:
+    """Key a baseline call on its model inputs only; hits are rebuilt per example by _record."""
+    return make_cache_key(
+        {
+            "model": model,
+            "question": example.question,
+            "choices": example.choices,
+            "context": example.context,
+            "temperature": round(float(temperature), 2),
+            "prompts": PROMPT_FINGERPRINT,
+        },
+        namespace=cache_ns,
+    )
+
+
+def _messages(user_prompt: str) -> List[Dict[str, str]]:
+    """Wrap a user prompt with the baseline system instruction."""
+    return [
         {"role": "system", "content": BASELINE_SYSTEM},
         {"role": "user", "content": user_prompt},
     ]
 
-    cache_key = None
-    if cache is not None:
-        cache_key = make_cache_key({"model": model, "messages": messages, "temperature": temperature})
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-    content, _ = client.chat(model=model, messages=messages, temperature=temperature)
 
-    # Choose the parsing strategy based on whether we have explicit choices.
-    if example.choices:
-        pred = extract_choice(content, example.choices) or "INVALID"
-    else:
-        pred = extract_label(content) or "INVALID"
-
-    record = {
+def _record(example: TaskExample, output: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a prediction record for example from a (possibly cached) model output."""
+    pred = output["prediction"]
+    return {
         "id": example.id,
         "task_type": example.task_type,
         "question": example.question,
@@ -48,14 +47,106 @@ def _predict_one(
         "label": example.label,
         "prediction": pred,
         "correct": pred == example.label,
-        "raw_response": content,
+        "raw_response": output["raw_response"],
         "meta": example.meta or {},
     }
 
+
+def _finish(
+    example: TaskExample,
+    content: str,
+    cache: Optional[SampleCache],
+    cache_key: Optional[str],
+) -> Dict[str, Any]:
+    """Parse a model response into a prediction record, caching only the model output."""
+    # Choose the parsing strategy based on whether we have explicit choices.
+    if example.choices:
+        pred = extract_choice(content, example.choices) or "INVALID"
+    else:
+        pred = extract_label(content) or "INVALID"
+
+    # Keys cover model inputs only, so examples sharing a question share an entry;
+    # id, label and meta always come from the current example.
+    output = {"prediction": pred, "raw_response": content}
     if cache is not None and cache_key is not None:
-        cache.set(cache_key, record)
+        cache.set(cache_key, output)
 
-    return record
+    return _record(example, output)
+
+
+def _predict_one(
+    example: TaskExample,
+    client: OpenAICompatClient,
+    model: str,
+    temperature: float,
+    user_prompt: str,
+    cache: Optional[SampleCache] = None,
+    cache_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run a single-shot prediction for a cache miss and store the record."""
+    messages = _messages(user_prompt)
+    content, _ = client.chat(model=model, messages=messages, temperature=temperature)
+    return _finish(example, content, cache, cache_key)
+
+
+async def _predict_one_async(
+    example: TaskExample,
+    client: OpenAICompatClient,
+    model: str,
+    temperature: float,
+    user_prompt: str,
+    cache: Optional[SampleCache] = None,
+    cache_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Async variant of _predict_one built on the client's achat."""
+    messages = _messages(user_prompt)
+    content, _ = await client.achat(model=model, messages=messages, temperature=temperature)
+    return _finish(example, content, cache, cache_key)
+
+
+async def _gather_baseline(
+    jobs: List[Tuple[TaskExample, str, Optional[str]]],
+    client: OpenAICompatClient,
+    model: str,
+    temperature: float,
+    cache: Optional[SampleCache],
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    """Run predictions on one event loop with at most `concurrency` requests in flight."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(job: Tuple[TaskExample, str, Optional[str]]) -> Dict[str, Any]:
+        ex, prompt, key = job
+        async with sem:
+            return await _predict_one_async(
+                ex, client, model, temperature, prompt, cache=cache, cache_key=key
+            )
+
+    return list(await asyncio.gather(*(one(job) for job in jobs)))
+
+
+async def _gather_and_close(
+    jobs: List[Tuple[TaskExample, str, Optional[str]]],
+    client: OpenAICompatClient,
+    model: str,
+    temperature: float,
+    cache: Optional[SampleCache],
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    """Run _gather_baseline on a throwaway loop, closing the async pool bound to it."""
+    try:
+        return await _gather_baseline(jobs, client, model, temperature, cache, concurrency)
+    finally:
+        await client.aclose()
+
+
+def _loop_running() -> bool:
+    """Return True when called from inside a running event loop (e.g. a notebook)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
 
 
 def run_baseline(
@@ -63,10 +154,44 @@ def run_baseline(
     client: OpenAICompatClient,
     model: str,
     temperature: float = 0.0,
-    cache: Optional[DiskCache] = None,
+    cache: Optional[SampleCache] = None,
+    cache_ns: str = "baseline",
+    concurrency: int = 1,
 ) -> List[Dict[str, Any]]:
-    """Run the baseline on a list of examples."""
-    outputs = []
-    for ex in examples:
-        outputs.append(_predict_one(ex, client, model, temperature, cache=cache))
-    return outputs
+    """Run the baseline on a list of examples, issuing up to `concurrency` requests at once."""
+    records: List[Optional[Dict[str, Any]]] = [None] * len(examples)
+    keys: List[Optional[str]] = [None] * len(examples)
+    if cache is not None:
+        for i, ex in enumerate(examples):
+            keys[i] = _cache_key(ex, model, temperature, cache_ns)
+            cached = cache.get(keys[i])
+            if cached is not None:
+                records[i] = _record(ex, cached)
+
+    # Only cache misses pay for prompt formatting and a slot in the request fan-out.
+    pending = [i for i, record in enumerate(records) if record is None]
+    jobs: List[Tuple[TaskExample, str, Optional[str]]] = []
+    for i in pending:
+        ex = examples[i]
+        jobs.append((ex, build_user_prompt(ex.question, ex.choices, ex.context), keys[i]))
+    if concurrency > 1 and len(jobs) > 1 and hasattr(client, "achat") and not _loop_running():
+        args = (jobs, client, model, temperature, cache, concurrency)
+        run_async = getattr(client, "run_async", None)
+        if run_async is not None:
+            # The client's own loop outlives this batch, so its connection pool stays warm
+            # until the caller closes the client.
+            fresh = run_async(_gather_baseline(*args))
+        else:
+            fresh = asyncio.run(_gather_and_close(*args))
+    else:
+        # Clients without an async API (manual, test fakes) fan out over threads instead.
+        fresh = ordered_map(
+            lambda job: _predict_one(
+                job[0], client, model, temperature, job[1], cache=cache, cache_key=job[2]
+            ),
+            jobs,
+            concurrency,
+        )
+    for i, record in zip(pending, fresh):
+        records[i] = record
+    return records
@@ -2,65 +2,78 @@
 
 from __future__ import annotations
 
+import importlib.util
 import logging
 import os
-import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from data.schema import TaskExample
+from llm.openai_compat import MAX_RETRY_DELAY, OpenAICompatClient
 from llm.parsing import extract_choice_strict, extract_label
-from systems.finrobot_tools import build_toolkits
+from systems.finrobot_tools import build_toolkits, resolve_toolkits
 from systems.prompts import (
     CRITIC_SYSTEM,
     CRITIC_SYSTEM_FULL,
     FINAL_SYSTEM,
     FINAL_SYSTEM_FULL,
     PLANNER_SYSTEM,
+    PROMPT_FINGERPRINT,
     PLANNER_SYSTEM_FULL,
     SOLVER_SYSTEM,
     SOLVER_SYSTEM_FULL,
     build_agent_prompt,
     build_user_prompt,
 )
-from utils.cache import DiskCache, make_cache_key
+from utils.cache import SampleCache, make_cache_key
+from utils.parallel import ordered_map
 
 
-def _ensure_finrobot_importable() -> None:
-    """Ensure the FinRobot package is importable, cloning if necessary."""
-    try:
-        import finrobot  # noqa: F401
+# Set once FinRobot is importable; kept across importlib.reload so re-imports skip probing.
+_FINROBOT_READY: bool = globals().get("_FINROBOT_READY", False)
 
-        return
-    except Exception:
-        pass
 
-    # Try explicit env path.
-    env_path = os.environ.get("FINROBOT_PATH")
-    if env_path and os.path.isdir(env_path):
-        sys.path.insert(0, env_path)
-        try:
-            import finrobot  # noqa: F401
+def _finrobot_on_path(path: Optional[str] = None) -> bool:
+    """Return True if finrobot resolves, optionally after prepending path to sys.path."""
+    if path is not None:
+        sys.path.insert(0, path)
+    if importlib.util.find_spec("finrobot") is not None:
+        return True
+    if path is not None:
+        sys.path.remove(path)
+    return False
 
-            return
-        except Exception:
-            sys.path.pop(0)
 
-    # Try local vendor path.
+def _ensure_finrobot_importable() -> None:
+    """Ensure the FinRobot package is importable, cloning only when opted in."""
+    global _FINROBOT_READY
+    if _FINROBOT_READY:
+        return
+
     repo_root = Path(__file__).resolve().parents[2]
     vendor_path = repo_root / "third_party" / "FinRobot"
-    if vendor_path.exists():
-        sys.path.insert(0, str(vendor_path))
-        try:
-            import finrobot  # noqa: F401
+    env_path = os.environ.get("FINROBOT_PATH")
+    if (
+        _finrobot_on_path()
+        or (env_path and os.path.isdir(env_path) and _finrobot_on_path(env_path))
+        or (vendor_path.exists() and _finrobot_on_path(str(vendor_path)))
+    ):
+        _FINROBOT_READY = True
+        return
 
-            return
-        except Exception:
-            sys.path.pop(0)
+    # Cloning from import time is a network stall, so it is strictly opt-in.
+    if os.environ.get("FINROBOT_AUTO_CLONE") != "1":
+        raise ImportError(
+            "FinRobot not found. Please clone https://github.com/AI4Finance-Foundation/FinRobot "
+            "into finrobot-pixiu-eval/third_party/FinRobot, set FINROBOT_PATH, "
+            "or set FINROBOT_AUTO_CLONE=1 to clone it automatically."
+        )
+    import subprocess
 
-    # Last resort: clone FinRobot into the repo.
     vendor_path.parent.mkdir(parents=True, exist_ok=True)
     try:
         subprocess.run(
@@ -74,25 +87,37 @@ def _ensure_finrobot_importable() -> None:
             ],
             check=True,
         )
-        sys.path.insert(0, str(vendor_path))
-        import finrobot  # noqa: F401
-
-        return
     except Exception as exc:
         raise ImportError(
             "FinRobot not found. Please clone https://github.com/AI4Finance-Foundation/FinRobot "
             "into finrobot-pixiu-eval/third_party/FinRobot or set FINROBOT_PATH."
         ) from exc
+    importlib.invalidate_caches()
+    if not _finrobot_on_path(str(vendor_path)):
+        raise ImportError(f"Cloned FinRobot into {vendor_path} but it is still not importable.")
+    _FINROBOT_READY = True
 
 
-_ensure_finrobot_importable()
+# FinRobot (and autogen behind it) is imported on first use so baseline-only runs skip it.
+MultiAssistant = None
+MultiAssistantWithLeader = None
+_IMPORT_ERROR: Optional[BaseException] = None
 
-try:
-    from finrobot.agents.workflow import MultiAssistant, MultiAssistantWithLeader
-except Exception as exc:  # pragma: no cover
-    MultiAssistant = None
-    MultiAssistantWithLeader = None
-    _IMPORT_ERROR = exc
+
+def _load_finrobot() -> None:
+    """Import the FinRobot workflow classes once, recording any failure."""
+    global MultiAssistant, MultiAssistantWithLeader, _IMPORT_ERROR
+    if MultiAssistant is not None:
+        return
+    try:
+        _ensure_finrobot_importable()
+        from finrobot.agents.workflow import MultiAssistant as _MultiAssistant
+        from finrobot.agents.workflow import MultiAssistantWithLeader as _WithLeader
+    except Exception as exc:
+        _IMPORT_ERROR = exc
+        return
+    MultiAssistant = _MultiAssistant
+    MultiAssistantWithLeader = _WithLeader
 
 
 def _strip_tool_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
@@ -106,6 +131,32 @@ def _strip_tool_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
     return clean
 
 
+# Leaf types json can encode as-is; anything else in a trace is stringified.
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+# Retry/backoff knobs change how often we call the API, not what it answers.
+_CACHE_IGNORED_FINROBOT_KEYS = frozenset({"api_max_retries", "api_retry_delay"})
+
+# Meta fields that describe the model run itself and are therefore cached with it.
+_OUTPUT_META_KEYS = (
+    "retry_used",
+    "api_retry_used",
+    "api_error",
+    "final_only_retry",
+    "retry_trace",
+    "retry_response",
+)
+
+
+def _llm_identity(llm_config: Dict[str, Any]) -> List[Any]:
+    """Return the parts of an AutoGen config that determine responses (no API keys)."""
+    models = [
+        [entry.get("model"), entry.get("base_url")]
+        for entry in llm_config.get("config_list", [])
+    ]
+    return [models, llm_config.get("max_tokens")]
+
+
 def _read_multiline_input() -> str:
     """Read multi-line manual input terminated by a single END line."""
     lines: List[str] = []
@@ -120,9 +171,16 @@ def _read_multiline_input() -> str:
     return "\n".join(lines).strip()
 
 
-if MultiAssistant is not None:
+_SAFE_CLASSES: Dict[type, type] = {}
+
 
-    class SafeMultiAssistant(MultiAssistant):
+def _safe_assistant_cls(base: type) -> type:
+    """Return (and cache) a subclass of base with a safer speaker selection."""
+    cached = _SAFE_CLASSES.get(base)
+    if cached is not None:
+        return cached
+
+    class SafeMultiAssistant(base):
         """MultiAssistant with a safer speaker selection for tool calls."""
 
         def _get_representative(self):
@@ -160,8 +218,8 @@ if MultiAssistant is not None:
             )
             return manager
 
-else:
-    SafeMultiAssistant = None
+    _SAFE_CLASSES[base] = SafeMultiAssistant
+    return SafeMultiAssistant
 
 
 class FinRobotAgentRunner:
@@ -173,8 +231,10 @@ class FinRobotAgentRunner:
         temperature: float = 0.0,
         no_critic: bool = False,
         finrobot_config: Optional[Dict[str, Any]] = None,
+        client: Optional[OpenAICompatClient] = None,
     ):
         """Initialize the runner with LLM config and FinRobot settings."""
+        _load_finrobot()
         if MultiAssistant is None:
             raise ImportError(
                 "Failed to import FinRobot. Please ensure finrobot is installed."
@@ -183,9 +243,41 @@ class FinRobotAgentRunner:
         self.temperature = temperature
         self.no_critic = no_critic
         self.finrobot_config = finrobot_config or {}
+        # Direct client used to redo only the Final step when a session fails late.
+        self.client = client
+        # Per-runner part of every cache key, serialized and hashed once so each
+        # example only hashes its own fields plus this short digest.
+        self._cache_scope = make_cache_key(
+            {
+                "system": "finrobot_agent_no_critic" if no_critic else "finrobot_agent",
+                "models": _llm_identity(llm_config),
+                "temperature": round(float(temperature), 2),
+                "finrobot_config": {
+                    k: v for k, v in self.finrobot_config.items() if k not in _CACHE_IGNORED_FINROBOT_KEYS
+                },
+                "prompts": PROMPT_FINGERPRINT,
+            }
+        )
         self._tool_info: Dict[str, Any] = {}
-        self._rag_assistants: List[Any] = []
+        # Per-thread state so one runner can serve several examples concurrently.
+        self._local = threading.local()
         self._logger = logging.getLogger("finrobot_pixiu_eval")
+        # Toolkits are stateless, so select them once and share them across groups;
+        # their modules are imported when the first group is built.
+        self._toolkits: List[Any] = []
+        mode = self.finrobot_config.get("mode", "minimal")
+        if bool(self.finrobot_config.get("enable_tools", mode == "full")):
+            self._toolkits, self._tool_info = build_toolkits(self.finrobot_config)
+            self._logger.info("FinRobot tools enabled: %s", self._tool_info.get("enabled", []))
+            skipped = self._tool_info.get("skipped", [])
+            if skipped:
+                self._logger.info("FinRobot tools skipped: %s", skipped)
+
+    def _rag_assistants(self) -> List[Any]:
+        """Return the RAG assistants attached to the current thread's group."""
+        if not hasattr(self._local, "rag_assistants"):
+            self._local.rag_assistants = []
+        return self._local.rag_assistants
 
     def _select_prompts(self) -> tuple[str, str, str, str]:
         """Pick role prompts based on minimal vs full mode."""
@@ -274,12 +366,7 @@ class FinRobotAgentRunner:
 
         toolkits: List[Any] = []
         if enable_tools:
-            toolkits, self._tool_info = build_toolkits(self.finrobot_config)
-            if self._logger:
-                self._logger.info("FinRobot tools enabled: %s", self._tool_info.get("enabled", []))
-                skipped = self._tool_info.get("skipped", [])
-                if skipped:
-                    self._logger.info("FinRobot tools skipped: %s", skipped)
+            toolkits = resolve_toolkits(self._toolkits, self._tool_info, self._logger)
 
             # Optional RAG utility from FinRobot.
             rag_cfg = self.finrobot_config.get("rag", {}) or {}
@@ -293,7 +380,7 @@ class FinRobotAgentRunner:
                     rag_desc = rag_cfg.get("description", "")
                     rag_func, rag_assistant = get_rag_function(retrieve_config, rag_desc)
                     toolkits.append(rag_func)
-                    self._rag_assistants.append(rag_assistant)
+                    self._rag_assistants().append(rag_assistant)
                 except Exception:
                     if self._logger:
                         self._logger.info("RAG tool could not be initialized; skipping.")
@@ -332,7 +419,7 @@ class FinRobotAgentRunner:
             return group
 
         group_config = {"name": "finrobot_eval_group"}
-        assistant_cls = SafeMultiAssistant if SafeMultiAssistant is not None else MultiAssistant
+        assistant_cls = _safe_assistant_cls(MultiAssistant)
         group = assistant_cls(
             group_config=group_config,
             agent_configs=agent_configs,
@@ -345,6 +432,34 @@ class FinRobotAgentRunner:
             group.group_chat.max_round = max_turns
         return group
 
+    def build_prompt(self, example: TaskExample) -> str:
+        """Build the initial user prompt for an example in the configured mode."""
+        if self.finrobot_config.get("mode", "minimal") == "full":
+            return build_agent_prompt(example.question, example.choices, example.context)
+        return build_user_prompt(example.question, example.choices, example.context)
+
+    def _group_signature(self) -> tuple:
+        """Return the settings that determine how the group is built."""
+        mode = self.finrobot_config.get("mode", "minimal")
+        return (
+            mode,
+            bool(self.finrobot_config.get("enable_tools", mode == "full")),
+            self.finrobot_config.get("workflow", "group_chat"),
+            int(self.finrobot_config.get("max_turns", 6)),
+            self.no_critic,
+        )
+
+    def _thread_group(self) -> MultiAssistant:
+        """Return this thread's group, building it only when the settings change."""
+        signature = self._group_signature()
+        group = getattr(self._local, "group", None)
+        if group is None or self._local.group_signature != signature:
+            self._local.rag_assistants = []
+            group = self._build_group()
+            self._local.group = group
+            self._local.group_signature = signature
+        return group
+
     def _extract_history(self, chat_result: Any, group: MultiAssistant) -> List[Dict[str, Any]]:
         """Pull chat history from AutoGen result or group chat."""
         history = []
@@ -358,133 +473,194 @@ class FinRobotAgentRunner:
 
     def _sanitize(self, obj: Any) -> Any:
         """Ensure trace objects are JSON-serializable for logging."""
-        if isinstance(obj, list):
+        if isinstance(obj, _JSON_SCALARS):
+            return obj
+        if isinstance(obj, (list, tuple)):
             return [self._sanitize(v) for v in obj]
         if isinstance(obj, dict):
             return {str(k): self._sanitize(v) for k, v in obj.items()}
-        try:
-            import json
-
-            json.dumps(obj)
-            return obj
-        except Exception:
-            return str(obj)
+        return str(obj)
 
-    def _extract_final_content(self, history: List[Dict[str, Any]]) -> str:
-        """Return the final agent message content, with a safe fallback."""
-        if not history:
-            return ""
-        for msg in reversed(history):
-            name = msg.get("name") if isinstance(msg, dict) else None
-            if name == "Final":
-                return msg.get("content", "")
-        last = history[-1]
-        return last.get("content", "") if isinstance(last, dict) else ""
-
-    def _extract_choice_from_history(
+    def _scan_history(
         self,
         history: List[Dict[str, Any]],
         choices: Optional[List[str]],
-    ) -> Optional[str]:
-        """Search the full trace for a strict answer letter."""
-        if not history:
-            return None
+    ) -> tuple[str, Optional[str]]:
+        """Return the Final content and the best strict choice from one reverse pass.
+
+        The choice parsed from the Final message wins; otherwise the latest
+        message that yields a strict answer letter is used.
+        """
+        final_found = False
+        final_content: Any = ""
+        final_choice: Optional[str] = None
+        trace_choice: Optional[str] = None
         for msg in reversed(history):
             if not isinstance(msg, dict):
                 continue
             content = msg.get("content", "")
-            if not content:
-                continue
-            pred = extract_choice_strict(content, choices)
-            if pred:
-                return pred
-        return None
+            is_final = not final_found and msg.get("name") == "Final"
+            choice = None
+            if choices and content and (is_final or trace_choice is None):
+                choice = extract_choice_strict(content, choices)
+            if is_final:
+                final_found = True
+                final_content = content
+                final_choice = choice
+            if trace_choice is None:
+                trace_choice = choice
+            if final_found and (not choices or final_choice or trace_choice):
+                break
+        if not final_found and history:
+            last = history[-1]
+            final_content = last.get("content", "") if isinstance(last, dict) else ""
+        return final_content, final_choice or trace_choice
 
     def _run_once(
         self,
         user_prompt: str,
         example: Optional[TaskExample] = None,
-    ) -> tuple[str, List[Dict[str, Any]]]:
-        """Run one agent session and return final content + trace."""
+    ) -> tuple[str, List[Dict[str, Any]], Optional[str]]:
+        """Run one agent session and return final content, trace and strict choice."""
+        # Clear before anything can raise, so a failure here never exposes the
+        # previous example's turns to the caller's final-only recovery.
+        self._local.partial_history = []
+        choices = example.choices if example is not None else None
         manual_mode = bool(self.finrobot_config.get("manual_mode", False))
         if manual_mode:
             if example is None:
-                return "", []
-            return self._run_once_manual(user_prompt, example)
-
-        group = self._build_group()
-        chat_result = group.user_proxy.initiate_chat(
-            group.representative,
-            message=user_prompt,
-            silent=True,
-        )
-        history = self._extract_history(chat_result, group)
-        final_content = self._extract_final_content(history)
+                return "", [], None
+            final_content, history = self._run_once_manual(user_prompt, example)
+            return final_content, history, self._scan_history(history, choices)[1]
 
-        # Reset the group to avoid state leakage across examples.
-        group.reset()
-        for rag_assistant in self._rag_assistants:
+        group = self._thread_group()
+        try:
+            chat_result = group.user_proxy.initiate_chat(
+                group.representative,
+                message=user_prompt,
+                silent=True,
+            )
+        except Exception:
+            # Mid-session failures (provider, tool or agent errors) take the caller's
+            # normal retry path. The group may be half-updated; rebuild it next time.
+            self._local.group = None
+            raise
+        history: List[Dict[str, Any]] = []
+        try:
+            history = self._extract_history(chat_result, group)
+            final_content, choice = self._scan_history(history, choices)
+
+            # Reset the group to avoid state leakage across examples.
+            group.reset()
+            if hasattr(group, "group_chat"):
+                group.group_chat.messages.clear()
+        except Exception:
+            # The session finished and only post-processing failed, so the caller may
+            # finish from the transcript with a single Final call.
+            if not history:
+                try:
+                    history = self._extract_history(None, group)
+                except Exception:
+                    history = []
+            self._local.partial_history = history
+            self._local.group = None
+            raise
+        for rag_assistant in self._rag_assistants():
             try:
                 rag_assistant.reset()
             except Exception:
                 pass
-        self._rag_assistants = []
-        return final_content, history
+        return final_content, history, choice
+
+    def _finish_from_history(
+        self,
+        example: TaskExample,
+        partial: List[Dict[str, Any]],
+    ) -> tuple[str, List[Dict[str, Any]], Optional[str]]:
+        """Ask for the Final answer in one direct call, using the turns already collected."""
+        transcript = "\n\n".join(
+            f"{msg.get('name', '')}: {msg.get('content')}"
+            for msg in partial
+            if isinstance(msg, dict) and msg.get("content")
+        )
+        strict_prompt = build_agent_prompt(
+            example.question, example.choices, example.context, strict=True
+        )
+        messages = [
+            {"role": "system", "content": self._select_prompts()[3]},
+            {"role": "user", "content": f"{strict_prompt}\n\nTeam discussion so far:\n{transcript}"},
+        ]
+        model = self.llm_config.get("config_list", [{}])[0].get("model")
+        content, _ = self.client.chat(model=model, messages=messages, temperature=self.temperature)
+        history = partial + [{"name": "Final", "content": content}]
+        final_content, choice = self._scan_history(history, example.choices)
+        return final_content, history, choice
 
     def predict_one(
         self,
         example: TaskExample,
-        cache: Optional[DiskCache] = None,
+        cache: Optional[SampleCache] = None,
+        cache_ns: str = "agent",
     ) -> Dict[str, Any]:
         """Run the agent on a single example and return a rich record."""
-        mode = self.finrobot_config.get("mode", "minimal")
-        if mode == "full":
-            user_prompt = build_agent_prompt(example.question, example.choices, example.context)
-        else:
-            user_prompt = build_user_prompt(example.question, example.choices, example.context)
-
+        # Look the example up before formatting any prompt; hits need no prompt at all.
+        # The key covers model inputs only, never id or label: _record rebuilds the rest.
         cache_key = None
         if cache is not None:
             cache_key = make_cache_key(
                 {
-                    "system": "finrobot_agent_no_critic" if self.no_critic else "finrobot_agent",
-                    "llm_config": self.llm_config,
-                    "prompt": user_prompt,
-                    "temperature": self.temperature,
-                    "finrobot_config": self.finrobot_config,
-                }
+                    "scope": self._cache_scope,
+                    "question": example.question,
+                    "choices": example.choices,
+                    "context": example.context,
+                },
+                namespace=cache_ns,
             )
             cached = cache.get(cache_key)
             if cached is not None:
-                return cached
+                return self._record(example, cached)
+
+        user_prompt = self.build_prompt(example)
 
         api_error: Optional[str] = None
+        final_only_retry = False
         api_retry_used = 0
         max_api_retries = int(self.finrobot_config.get("api_max_retries", 2))
         retry_delay = float(self.finrobot_config.get("api_retry_delay", 1.0))
         delay = retry_delay if retry_delay > 0 else 1.0
         while True:
             try:
-                final_content, history = self._run_once(user_prompt, example=example)
+                final_content, history, trace_choice = self._run_once(user_prompt, example=example)
                 break
             except Exception as exc:
                 api_error = str(exc)
+                # partial_history is only set when the session finished and post-processing
+                # failed; then one direct Final call is far cheaper than a full replay.
+                partial = getattr(self._local, "partial_history", [])
+                if self.client is not None and len(partial) > 1:
+                    try:
+                        final_content, history, trace_choice = self._finish_from_history(
+                            example, partial
+                        )
+                        final_only_retry = True
+                        break
+                    except Exception as final_exc:
+                        api_error = str(final_exc)
                 if api_retry_used >= max_api_retries:
                     final_content = f"ERROR: {api_error}"
                     history = []
+                    trace_choice = None
                     break
                 time.sleep(delay)
                 api_retry_used += 1
-                delay *= 2
+                delay = min(delay * 2, MAX_RETRY_DELAY)
         pred: Optional[str] = None
         retry_used = 0
         retry_trace: Optional[List[Dict[str, Any]]] = None
         retry_response: Optional[str] = None
 
         if example.choices:
-            pred = extract_choice_strict(final_content, example.choices)
-            if pred is None:
-                pred = self._extract_choice_from_history(history, example.choices)
+            pred = trace_choice
         else:
             pred = extract_label(final_content)
 
@@ -500,11 +676,11 @@ class FinRobotAgentRunner:
             )
             for _ in range(max_retries):
                 retry_used += 1
-                retry_response, retry_trace = self._run_once(strict_prompt, example=example)
+                retry_response, retry_trace, retry_choice = self._run_once(
+                    strict_prompt, example=example
+                )
                 if example.choices:
-                    pred = extract_choice_strict(retry_response, example.choices)
-                    if pred is None and retry_trace is not None:
-                        pred = self._extract_choice_from_history(retry_trace, example.choices)
+                    pred = retry_choice
                 else:
                     pred = extract_label(retry_response)
                 if pred is not None:
@@ -513,7 +689,29 @@ class FinRobotAgentRunner:
         if pred is None:
             pred = "INVALID"
 
-        record = {
+        # Only the model output is cached: keys cover model inputs, so examples that
+        # share a question share an entry, and everything else comes from the example.
+        meta: Dict[str, Any] = {"retry_used": retry_used, "api_retry_used": api_retry_used}
+        if api_error:
+            meta["api_error"] = api_error
+        if final_only_retry:
+            meta["final_only_retry"] = True
+        if retry_used and retry_trace is not None:
+            meta["retry_trace"] = retry_trace
+            meta["retry_response"] = retry_response
+        output = {"prediction": pred, "raw_response": final_content, "trace": history, "meta": meta}
+
+        # Final-only answers come from one direct call, not an agent session; never
+        # replay them as agent results.
+        if cache is not None and cache_key is not None and not final_only_retry:
+            cache.set(cache_key, output)
+
+        return self._record(example, output)
+
+    def _record(self, example: TaskExample, output: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a prediction record for example from a (possibly cached) model output."""
+        pred = output["prediction"]
+        return {
             "id": example.id,
             "task_type": example.task_type,
             "question": example.question,
@@ -521,26 +719,15 @@ class FinRobotAgentRunner:
             "label": example.label,
             "prediction": pred,
             "correct": pred == example.label,
-            "raw_response": final_content,
-            "trace": history,
+            "raw_response": output["raw_response"],
+            "trace": output["trace"],
             "meta": {
                 **(example.meta or {}),
                 "finrobot_tool_info": self._tool_info,
                 "finrobot_mode": self.finrobot_config.get("mode", "minimal"),
-                "retry_used": retry_used,
-                "api_retry_used": api_retry_used,
+                **{k: output["meta"][k] for k in _OUTPUT_META_KEYS if k in output["meta"]},
             },
         }
-        if api_error:
-            record["meta"]["api_error"] = api_error
-        if retry_used and retry_trace is not None:
-            record["meta"]["retry_trace"] = retry_trace
-            record["meta"]["retry_response"] = retry_response
-
-        if cache is not None and cache_key is not None:
-            cache.set(cache_key, record)
-
-        return record
 
 
 def run_agent(
@@ -548,17 +735,31 @@ def run_agent(
     llm_config: Dict[str, Any],
     temperature: float = 0.0,
     no_critic: bool = False,
-    cache: Optional[DiskCache] = None,
+    cache: Optional[SampleCache] = None,
+    cache_ns: str = "agent",
     finrobot_config: Optional[Dict[str, Any]] = None,
+    concurrency: int = 1,
+    client: Optional[OpenAICompatClient] = None,
+    runner: Optional[FinRobotAgentRunner] = None,
+    executor: Optional[Executor] = None,
 ) -> List[Dict[str, Any]]:
-    """Run the FinRobot agent over a list of examples."""
-    runner = FinRobotAgentRunner(
-        llm_config=llm_config,
-        temperature=temperature,
-        no_critic=no_critic,
-        finrobot_config=finrobot_config,
+    """Run the FinRobot agent over a list of examples, `concurrency` sessions at a time.
+
+    Pass a prebuilt runner and a long-lived executor to reuse the toolkits and
+    per-thread groups across calls; groups live as long as the worker threads.
+    """
+    if runner is None:
+        runner = FinRobotAgentRunner(
+            llm_config=llm_config,
+            temperature=temperature,
+            no_critic=no_critic,
+            finrobot_config=finrobot_config,
+            client=client,
+        )
+    # Prompts are built inside predict_one, after the cache lookup, so hits skip them.
+    return ordered_map(
+        lambda ex: runner.predict_one(ex, cache=cache, cache_ns=cache_ns),
+        examples,
+        concurrency,
+        executor=executor,
     )
-    outputs = []
-    for ex in examples:
-        outputs.append(runner.predict_one(ex, cache=cache))
-    return outputs
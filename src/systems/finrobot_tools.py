@@ -2,174 +2,232 @@
 
 from __future__ import annotations
 
-import importlib
+import logging
 import os
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class ToolkitSpec:
     """Metadata describing a FinRobot toolkit and its required env keys."""
 
     name: str
     module: str
     attr: str
-    env_keys: List[str]
-
-
-def _safe_get_attr(module_path: str, attr: str) -> Any:
-    """Import a module attribute safely, returning None on failure."""
-    try:
-        mod = importlib.import_module(module_path)
-        return getattr(mod, attr)
-    except Exception:
-        return None
-
-
-def _has_env(keys: List[str]) -> bool:
-    """Return True when all required environment variables are present."""
-    if not keys:
-        return True
-    return all(os.environ.get(k) for k in keys)
-
-
-def _default_toolsets() -> List[str]:
-    """Default toolsets enabled when config requests auto-selection."""
-    return [
-        "finnhub",
-        "fmp",
-        "sec",
-        "yfinance",
-        "reddit",
-        "finnlp",
-        "analysis",
-        "charting",
-        "report_charting",
-        "reportlab",
-        "text",
-        "quant",
-        "coding",
-        "ipython",
-    ]
-
-
-def _tool_specs() -> Dict[str, ToolkitSpec]:
-    """Registry of known FinRobot toolkits and their import paths."""
-    return {
-        "finnhub": ToolkitSpec(
-            name="finnhub",
-            module="finrobot.data_source.finnhub_utils",
-            attr="FinnHubUtils",
-            env_keys=["FINNHUB_API_KEY"],
-        ),
-        "fmp": ToolkitSpec(
-            name="fmp",
-            module="finrobot.data_source.fmp_utils",
-            attr="FMPUtils",
-            env_keys=["FMP_API_KEY"],
-        ),
-        "sec": ToolkitSpec(
-            name="sec",
-            module="finrobot.data_source.sec_utils",
-            attr="SECUtils",
-            env_keys=["SEC_API_KEY"],
-        ),
-        "yfinance": ToolkitSpec(
-            name="yfinance",
-            module="finrobot.data_source.yfinance_utils",
-            attr="YFinanceUtils",
-            env_keys=[],
-        ),
-        "reddit": ToolkitSpec(
-            name="reddit",
-            module="finrobot.data_source.reddit_utils",
-            attr="RedditUtils",
-            env_keys=["REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET"],
-        ),
-        "finnlp": ToolkitSpec(
-            name="finnlp",
-            module="finrobot.data_source.finnlp_utils",
-            attr="FinNLPUtils",
-            env_keys=[],
-        ),
-        "analysis": ToolkitSpec(
-            name="analysis",
-            module="finrobot.functional.analyzer",
-            attr="ReportAnalysisUtils",
-            env_keys=["SEC_API_KEY", "FMP_API_KEY"],
-        ),
-        "charting": ToolkitSpec(
-            name="charting",
-            module="finrobot.functional.charting",
-            attr="MplFinanceUtils",
-            env_keys=[],
-        ),
-        "report_charting": ToolkitSpec(
-            name="report_charting",
-            module="finrobot.functional.charting",
-            attr="ReportChartUtils",
-            env_keys=[],
-        ),
-        "reportlab": ToolkitSpec(
-            name="reportlab",
-            module="finrobot.functional.reportlab",
-            attr="ReportLabUtils",
-            env_keys=[],
-        ),
-        "text": ToolkitSpec(
-            name="text",
-            module="finrobot.functional.text",
-            attr="TextUtils",
-            env_keys=[],
-        ),
-        "quant": ToolkitSpec(
-            name="quant",
-            module="finrobot.functional.quantitative",
-            attr="BackTraderUtils",
-            env_keys=[],
-        ),
-        "coding": ToolkitSpec(
-            name="coding",
-            module="finrobot.functional.coding",
-            attr="CodingUtils",
-            env_keys=[],
-        ),
-        "ipython": ToolkitSpec(
-            name="ipython",
-            module="finrobot.functional.coding",
-            attr="IPythonUtils",
-            env_keys=[],
-        ),
-    }
+    env_keys: Tuple[str, ...]
+
+
+_INFO_LOCK = threading.Lock()
+
+
+class _LazyToolkit:
+    """Deferred reference to a toolkit class, imported the first time it is needed."""
+
+    def __init__(self, spec: ToolkitSpec):
+        """Remember the spec without importing its module."""
+        self.spec = spec
+        self._cls: Any = None
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Any:
+        """Import and cache the toolkit class, returning None if the import fails."""
+        with self._lock:
+            if self._cls is None and self._error is None:
+                import importlib
+
+                try:
+                    self._cls = getattr(importlib.import_module(self.spec.module), self.spec.attr)
+                except Exception as exc:
+                    self._error = exc
+            return self._cls
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Instantiate the underlying toolkit class."""
+        cls = self.resolve()
+        if cls is None:
+            raise ImportError(f"Toolkit {self.spec.name} is unavailable") from self._error
+        return cls(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward attribute access to the resolved class."""
+        cls = self.resolve()
+        if cls is None:
+            raise AttributeError(name)
+        return getattr(cls, name)
+
+
+def resolve_toolkits(
+    toolkits: List[Any], info: Dict[str, Any], logger: Optional[logging.Logger] = None
+) -> List[Any]:
+    """Import lazy toolkits, moving any that fail to info["skipped"] as import_failed."""
+    resolved: List[Any] = []
+    for toolkit in toolkits:
+        if not isinstance(toolkit, _LazyToolkit):
+            resolved.append(toolkit)
+            continue
+        cls = toolkit.resolve()
+        if cls is not None:
+            resolved.append(cls)
+            continue
+        name = toolkit.spec.name
+        # Worker threads resolve concurrently; report each failure exactly once.
+        with _INFO_LOCK:
+            if name not in info["enabled"]:
+                continue
+            info["enabled"].remove(name)
+            info["skipped"].append(
+                {"name": name, "reason": "import_failed", "module": toolkit.spec.module}
+            )
+        if logger:
+            logger.warning("FinRobot toolkit %s failed to import; skipping.", name)
+    return resolved
+
+
+# Toolsets enabled when config requests auto-selection.
+_DEFAULT_TOOLSETS: Tuple[str, ...] = (
+    "finnhub",
+    "fmp",
+    "sec",
+    "yfinance",
+    "reddit",
+    "finnlp",
+    "analysis",
+    "charting",
+    "report_charting",
+    "reportlab",
+    "text",
+    "quant",
+    "coding",
+    "ipython",
+)
+
+
+# Registry of known FinRobot toolkits and their import paths.
+_TOOL_SPECS: Dict[str, ToolkitSpec] = {
+    "finnhub": ToolkitSpec(
+        name="finnhub",
+        module="finrobot.data_source.finnhub_utils",
+        attr="FinnHubUtils",
+        env_keys=("FINNHUB_API_KEY",),
+    ),
+    "fmp": ToolkitSpec(
+        name="fmp",
+        module="finrobot.data_source.fmp_utils",
+        attr="FMPUtils",
+        env_keys=("FMP_API_KEY",),
+    ),
+    "sec": ToolkitSpec(
+        name="sec",
+        module="finrobot.data_source.sec_utils",
+        attr="SECUtils",
+        env_keys=("SEC_API_KEY",),
+    ),
+    "yfinance": ToolkitSpec(
+        name="yfinance",
+        module="finrobot.data_source.yfinance_utils",
+        attr="YFinanceUtils",
+        env_keys=(),
+    ),
+    "reddit": ToolkitSpec(
+        name="reddit",
+        module="finrobot.data_source.reddit_utils",
+        attr="RedditUtils",
+        env_keys=("REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET"),
+    ),
+    "finnlp": ToolkitSpec(
+        name="finnlp",
+        module="finrobot.data_source.finnlp_utils",
+        attr="FinNLPUtils",
+        env_keys=(),
+    ),
+    "analysis": ToolkitSpec(
+        name="analysis",
+        module="finrobot.functional.analyzer",
+        attr="ReportAnalysisUtils",
+        env_keys=("SEC_API_KEY", "FMP_API_KEY"),
+    ),
+    "charting": ToolkitSpec(
+        name="charting",
+        module="finrobot.functional.charting",
+        attr="MplFinanceUtils",
+        env_keys=(),
+    ),
+    "report_charting": ToolkitSpec(
+        name="report_charting",
+        module="finrobot.functional.charting",
+        attr="ReportChartUtils",
+        env_keys=(),
+    ),
+    "reportlab": ToolkitSpec(
+        name="reportlab",
+        module="finrobot.functional.reportlab",
+        attr="ReportLabUtils",
+        env_keys=(),
+    ),
+    "text": ToolkitSpec(
+        name="text",
+        module="finrobot.functional.text",
+        attr="TextUtils",
+        env_keys=(),
+    ),
+    "quant": ToolkitSpec(
+        name="quant",
+        module="finrobot.functional.quantitative",
+        attr="BackTraderUtils",
+        env_keys=(),
+    ),
+    "coding": ToolkitSpec(
+        name="coding",
+        module="finrobot.functional.coding",
+        attr="CodingUtils",
+        env_keys=(),
+    ),
+    "ipython": ToolkitSpec(
+        name="ipython",
+        module="finrobot.functional.coding",
+        attr="IPythonUtils",
+        env_keys=(),
+    ),
+}
+
+# Every env key any toolkit needs, so one pass over the environment covers all specs.
+_ALL_ENV_KEYS = frozenset(key for spec in _TOOL_SPECS.values() for key in spec.env_keys)
+
+
+def _present_env_keys() -> FrozenSet[str]:
+    """Return the toolkit env keys set to a non-empty value (empty counts as missing)."""
+    env = os.environ
+    return frozenset(key for key in _ALL_ENV_KEYS if env.get(key))
 
 
 def build_toolkits(config: Dict[str, Any]) -> Tuple[List[Any], Dict[str, Any]]:
-    """Resolve toolkits based on config + available dependencies."""
-    toolsets = config.get("toolsets") or []
+    """Select toolkits based on config + environment; entries are lazy until resolved."""
+    toolsets = tuple(config.get("toolsets") or ())
     if not toolsets or "auto" in toolsets:
-        toolsets = _default_toolsets()
-    specs = _tool_specs()
+        toolsets = _DEFAULT_TOOLSETS
     toolkits: List[Any] = []
     info: Dict[str, Any] = {"enabled": [], "skipped": []}
 
+    enabled = info["enabled"]
+    skipped = info["skipped"]
+    specs_get = _TOOL_SPECS.get
+    # Read the environment once instead of per toolset; many share the same keys.
+    present = _present_env_keys()
     for name in toolsets:
-        spec = specs.get(name)
+        # Cheapest check first: the registry lookup, then the environment.
+        spec = specs_get(name)
         if spec is None:
-            info["skipped"].append({"name": name, "reason": "unknown_toolset"})
-            continue
-        if not _has_env(spec.env_keys):
-            info["skipped"].append(
-                {"name": name, "reason": "missing_env", "env_keys": spec.env_keys}
-            )
-            continue
-        cls = _safe_get_attr(spec.module, spec.attr)
-        if cls is None:
-            info["skipped"].append(
-                {"name": name, "reason": "import_failed", "module": spec.module}
-            )
+            record = {"name": name, "reason": "unknown_toolset"}
+        elif not present.issuperset(spec.env_keys):
+            record = {"name": name, "reason": "missing_env", "env_keys": list(spec.env_keys)}
+        else:
+            # Imports are deferred to resolve_toolkits, when a group actually needs them.
+            toolkits.append(_LazyToolkit(spec))
+            enabled.append(name)
             continue
-        toolkits.append(cls)
-        info["enabled"].append(name)
+        skipped.append(record)
 
     return toolkits, info
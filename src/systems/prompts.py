@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import sys
 from typing import List, Optional
 
 # Baseline system instruction kept short to avoid distracting the model.
@@ -63,36 +65,88 @@ FINAL_SYSTEM_FULL = (
     "Return exactly two lines: 'Answer: <LABEL>' and 'TERMINATE'."
 )
 
+# Intern the role prompts so every message dict, and any equal string interned
+# elsewhere, shares one object per prompt.
+BASELINE_SYSTEM = sys.intern(BASELINE_SYSTEM)
+PLANNER_SYSTEM = sys.intern(PLANNER_SYSTEM)
+SOLVER_SYSTEM = sys.intern(SOLVER_SYSTEM)
+CRITIC_SYSTEM = sys.intern(CRITIC_SYSTEM)
+FINAL_SYSTEM = sys.intern(FINAL_SYSTEM)
+PLANNER_SYSTEM_FULL = sys.intern(PLANNER_SYSTEM_FULL)
+SOLVER_SYSTEM_FULL = sys.intern(SOLVER_SYSTEM_FULL)
+CRITIC_SYSTEM_FULL = sys.intern(CRITIC_SYSTEM_FULL)
+FINAL_SYSTEM_FULL = sys.intern(FINAL_SYSTEM_FULL)
+
+# Cache keys use raw example fields instead of rendered prompts, so template edits
+# must change this fingerprint; bump PROMPT_VERSION when editing the builders below.
+PROMPT_VERSION = "1"
+PROMPT_FINGERPRINT = hashlib.blake2b(
+    "\x1f".join(
+        [
+            PROMPT_VERSION,
+            BASELINE_SYSTEM,
+            BASELINE_USER_TEMPLATE,
+            PLANNER_SYSTEM,
+            SOLVER_SYSTEM,
+            CRITIC_SYSTEM,
+            FINAL_SYSTEM,
+            PLANNER_SYSTEM_FULL,
+            SOLVER_SYSTEM_FULL,
+            CRITIC_SYSTEM_FULL,
+            FINAL_SYSTEM_FULL,
+        ]
+    ).encode("utf-8"),
+    digest_size=8,
+).hexdigest()
+
+
+# Choice tags and valid-label lists only depend on the index, so build them once.
+_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_TAGS = tuple(f"{c}. " for c in _LETTERS)
+_VALID_LABELS = tuple(", ".join(_LETTERS[:n]) for n in range(len(_LETTERS) + 1))
+
 
 def format_choices(choices: Optional[List[str]]) -> str:
     """Format a multiple-choice list as labeled lines."""
     if not choices:
         return ""
-    lines = []
-    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    for i, c in enumerate(choices):
-        tag = letters[i] if i < len(letters) else str(i)
-        lines.append(f"{tag}. {c}")
-    return "Choices:\n" + "\n".join(lines)
+    return "Choices:\n" + "\n".join(
+        (_TAGS[i] if i < 26 else f"{i}. ") + c for i, c in enumerate(choices)
+    )
 
 
-def build_user_prompt(question: str, choices: Optional[List[str]], context: Optional[str] = None) -> str:
-    """Build the base user prompt used by baseline and agent roles."""
-    choices_block = format_choices(choices)
-    if choices_block:
-        choices_block += "\n"
-    context_block = ""
-    if context:
-        context_block = f"Context:\n{context}\n\n"
-    answer_format = "A/B/C/D" if choices and len(choices) <= 4 else "LETTER"
+# The rendered prompt ends at the last template line; agent prompts append their tail.
+_PROMPT_TEMPLATE = BASELINE_USER_TEMPLATE.rstrip("\n") + "{agent_tail}"
+
+
+def _build(question: str, choices: Optional[List[str]], context: Optional[str], mode: str) -> str:
+    """Render the user prompt plus the tail for mode ("user", "agent" or "strict")."""
     if not choices:
         answer_format = "LABEL"
-    return BASELINE_USER_TEMPLATE.format(
+        agent_tail = "" if mode == "user" else "\n\nReturn only the label."
+    else:
+        answer_format = "A/B/C/D" if len(choices) <= 4 else "LETTER"
+        if mode == "user":
+            agent_tail = ""
+        else:
+            # Past 26 choices the label list stays capped at A-Z, as before.
+            valid = _VALID_LABELS[min(len(choices), 26)]
+            if mode == "strict":
+                agent_tail = f"\n\nValid labels: {valid}\nReturn exactly two lines:\nAnswer: <LABEL>\nTERMINATE"
+            else:
+                agent_tail = f"\n\nValid labels: {valid}\nReturn only one label."
+    return _PROMPT_TEMPLATE.format(
         question=question,
-        context_block=context_block,
-        choices_block=choices_block,
+        context_block=f"Context:\n{context}\n\n" if context else "",
+        choices_block=format_choices(choices) + "\n" if choices else "",
         answer_format=answer_format,
-    ).strip()
+        agent_tail=agent_tail,
+    )
+
+
+def build_user_prompt(question: str, choices: Optional[List[str]], context: Optional[str] = None) -> str:
+    """Build the base user prompt used by baseline and agent roles."""
+    return _build(question, choices, context, "user")
 
 
 def build_agent_prompt(
@@ -102,11 +156,4 @@ def build_agent_prompt(
     strict: bool = False,
 ) -> str:
     """Build a stricter agent prompt that enumerates valid labels."""
-    base = build_user_prompt(question, choices, context)
-    if not choices:
-        return base + "\n\nReturn only the label."
-    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    valid = ", ".join(list(letters[: len(choices)]))
-    if strict:
-        return base + f"\n\nValid labels: {valid}\nReturn exactly two lines:\nAnswer: <LABEL>\nTERMINATE"
-    return base + f"\n\nValid labels: {valid}\nReturn only one label."
+    return _build(question, choices, context, "strict" if strict else "agent")
@@ -1 +1 @@
-"""Shared utility helpers (logging, caching, retry, seeding)."""
+"""Shared utility helpers (logging, caching, retry, seeding, thread fan-out)."""
@@ -3,43 +3,175 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import os
-from typing import Any, Dict, Optional
+import threading
+from typing import IO, Any, Dict, List, Optional, Union
+
+from .jsonio import dumps_bytes, dumps_canonical, loads
+from .sqlite_cache import SQLiteCache
+
+
+def _record_line(key: str, value: Any) -> bytes:
+    """Encode one JSONL cache record (orjson when installed, never containing a raw newline)."""
+    return dumps_bytes({"k": key, "v": value}) + b"\n"
 
 
 class DiskCache:
-    """Tiny JSON file cache for reproducible runs."""
+    """Append-only JSONL file cache for reproducible runs, safe to share across threads.
 
-    def __init__(self, path: str):
-        """Initialize a disk cache backed by a JSON file."""
+    Each set appends one {"k", "v"} line, so write volume grows with the number
+    of entries rather than quadratically; close() compacts the log to one line
+    per key. Later lines win when the log is replayed on open.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 64):
+        """Initialize a disk cache backed by a JSONL log at path."""
         self.path = path
+        self.fsync_every = max(1, int(fsync_every))
         self._data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._file: Optional[IO[bytes]] = None
+        self._unsynced = 0
         os.makedirs(os.path.dirname(path), exist_ok=True)
         if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    self._data = json.load(f)
-            except Exception:
-                # Corrupted cache files are treated as empty.
-                self._data = {}
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        record = loads(line)
+                        self._data[record["k"]] = record["v"]
+                    except Exception:
+                        # A torn or corrupted line (e.g. after a crash) is skipped.
+                        continue
 
     def get(self, key: str) -> Optional[Any]:
         """Return cached value for key if present."""
-        return self._data.get(key)
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """Insert a value and append it to the log."""
+        line = _record_line(key, value)
+        with self._lock:
+            self._data[key] = value
+            self._append(line)
+
+    def flush(self) -> None:
+        """Fsync any appended lines not yet synced."""
+        with self._lock:
+            self._sync()
+
+    def close(self, compact: bool = True) -> None:
+        """Sync the log, then optionally rewrite it with one line per key."""
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if compact and self._data:
+                self._compact()
+
+    def _append(self, line: bytes) -> None:
+        """Append one log line, fsyncing every fsync_every writes (caller must hold the lock)."""
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(line)
+        # Hand each line to the OS so other readers see it; fsync only in batches.
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _sync(self) -> None:
+        """Fsync the open log file (caller must hold the lock)."""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _compact(self) -> None:
+        """Atomically replace the log with its latest values (caller must hold the lock)."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for key, value in self._data.items():
+                f.write(_record_line(key, value))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class SampleCache:
+    """List-valued view over a cache backend that replays stored samples in order.
+
+    Each key maps to a list of records. Within one session the i-th request
+    for a key receives the i-th stored record; once the list is exhausted the
+    caller issues a fresh LLM call and its result is appended. Sampled runs
+    (temperature > 0) therefore get independent draws per request while still
+    reusing everything an earlier run stored. With resample=False every request
+    for a key shares the first record, matching deterministic decoding.
+    """
+
+    def __init__(self, backend: Union[SQLiteCache, DiskCache], resample: bool = True):
+        """Wrap a get/set backend; resample controls per-session rotation."""
+        self.backend = backend
+        self.resample = resample
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _samples(self, key: str) -> List[Any]:
+        """Return a copy of the stored samples for key, upgrading single-record entries."""
+        value = self.backend.get(key)
+        if value is None:
+            return []
+        # Copy so appends never touch a list the backend (e.g. DiskCache) still holds.
+        return list(value) if isinstance(value, list) else [value]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the next unused sample for key in this session, if any."""
+        with self._lock:
+            samples = self._samples(key)
+            if not self.resample:
+                return samples[0] if samples else None
+            index = self._cursor.get(key, 0)
+            if index >= len(samples):
+                return None
+            self._cursor[key] = index + 1
+            return samples[index]
 
     def set(self, key: str, value: Any) -> None:
-        """Insert a value and persist it to disk."""
-        self._data[key] = value
-        self._persist()
+        """Append a freshly generated sample and mark it used by this session."""
+        with self._lock:
+            # Re-read under the lock: another writer sharing cache_dir may have appended
+            # since the miss, and those samples must not be overwritten.
+            samples = self._samples(key)
+            if not self.resample and samples:
+                return
+            samples.append(value)
+            self.backend.set(key, samples)
+            self._cursor[key] = self._cursor.get(key, 0) + 1
+
+    def close(self) -> None:
+        """Close the underlying backend."""
+        self.backend.close()
+
 
-    def _persist(self) -> None:
-        """Write the full cache to disk."""
-        with open(self.path, "w") as f:
-            json.dump(self._data, f, ensure_ascii=True, indent=2)
+def make_cache_key(payload: Any, namespace: Optional[str] = None) -> str:
+    """Create a stable hash key from a JSON-serializable payload, optionally namespaced."""
+    # Keys only need to be stable and collision-free, so a 128-bit blake2b suffices.
+    digest = hashlib.blake2b(dumps_canonical(payload), digest_size=16).hexdigest()
+    return f"{namespace}:{digest}" if namespace else digest
 
 
-def make_cache_key(payload: Any) -> str:
-    """Create a stable hash key from a JSON-serializable payload."""
-    raw = json.dumps(payload, sort_keys=True, ensure_ascii=True)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+def open_cache(
+    cache_dir: str, enabled: bool = True, backend: str = "sqlite", resample: bool = True
+) -> Optional[SampleCache]:
+    """Open the single response cache shared by every system in a run."""
+    if not enabled:
+        return None
+    if backend == "sqlite":
+        store: Union[SQLiteCache, DiskCache] = SQLiteCache(os.path.join(cache_dir, "cache.sqlite"))
+    elif backend == "json":
+        store = DiskCache(os.path.join(cache_dir, "cache.jsonl"))
+    else:
+        raise ValueError(f"Unsupported cache_backend: {backend}")
+    return SampleCache(store, resample=resample)
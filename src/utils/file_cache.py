@@ -0,0 +1,37 @@
+"""Process-level cache for parsed config files, keyed by path and mtime."""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeLoader
+
+_YAML_CACHE: Dict[Tuple[str, int, int], Any] = {}
+_LOCK = threading.Lock()
+
+
+def cached_yaml(path: str) -> Any:
+    """Parse a YAML file, reusing the previous result while the file is unchanged."""
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    key = (real, st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        data = _YAML_CACHE.get(key)
+    if data is None:
+        with open(real, "r") as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        with _LOCK:
+            # Drop stale entries for this path so edits do not accumulate.
+            for old in [k for k in _YAML_CACHE if k[0] == real]:
+                del _YAML_CACHE[old]
+            _YAML_CACHE[key] = data
+    # Hand out a copy so callers can mutate their config freely.
+    return copy.deepcopy(data)
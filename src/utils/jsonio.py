@@ -0,0 +1,35 @@
+"""JSON encoding helpers that use orjson when installed and the stdlib otherwise."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=True, indent=2 if indent else None).encode("utf-8")
+
+
+def dumps_canonical(obj: Any) -> bytes:
+    """Serialize obj to compact, key-sorted UTF-8 JSON, always with the stdlib encoder."""
+    # orjson formats some floats differently (1e16 vs 1e+16) and rejects non-str keys,
+    # so using it here would make cache keys depend on whether it is installed.
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
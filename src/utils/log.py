@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
 import os
-from typing import Optional
+from logging.handlers import MemoryHandler
+from typing import Optional, Set
+
+# Handlers share one formatter instead of building a new one per setup call.
+_FORMATTER = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+# Log directories already created in this process, so repeat calls skip the syscalls.
+_MKDIR_CACHE: Set[str] = set()
+# File records are buffered and written in batches; errors flush immediately.
+_FILE_BUFFER_CAPACITY = 1024
 
 
 def setup_logger(log_path: Optional[str] = None) -> logging.Logger:
@@ -14,16 +23,27 @@ def setup_logger(log_path: Optional[str] = None) -> logging.Logger:
         return logger
 
     logger.setLevel(logging.INFO)
-    formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
 
     stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
+    stream_handler.setFormatter(_FORMATTER)
     logger.addHandler(stream_handler)
 
     if log_path:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        log_dir = os.path.dirname(log_path)
+        if log_dir and log_dir not in _MKDIR_CACHE:
+            os.makedirs(log_dir, exist_ok=True)
+            _MKDIR_CACHE.add(log_dir)
         file_handler = logging.FileHandler(log_path)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(_FORMATTER)
+        buffered = MemoryHandler(_FILE_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler)
+        logger.addHandler(buffered)
+        # Write out whatever is still buffered when the process exits.
+        atexit.register(buffered.flush)
 
     return logger
+
+
+def flush_logger(logger: logging.Logger) -> None:
+    """Write out any records the logger's handlers are still buffering."""
+    for handler in logger.handlers:
+        handler.flush()
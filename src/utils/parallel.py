@@ -0,0 +1,30 @@
+"""Thread-pool helpers for fanning out network-bound LLM calls."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    func: Callable[[T], R],
+    items: Sequence[T],
+    concurrency: int = 1,
+    executor: Optional[Executor] = None,
+) -> List[R]:
+    """Apply func to every item over a thread pool, returning results in input order.
+
+    Pass a long-lived executor to keep the same worker threads (and any
+    thread-local state) across calls; it then bounds the parallelism itself.
+    """
+    if executor is not None:
+        return list(executor.map(func, items))
+    workers = min(int(concurrency), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    # LLM calls are network-bound and release the GIL, so threads scale well here.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
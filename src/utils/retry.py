@@ -3,9 +3,21 @@
 from __future__ import annotations
 
 import time
+from functools import lru_cache
 from typing import Callable, Tuple, Type
 
 
+@lru_cache(maxsize=32)
+def _delay_schedule(max_attempts: int, base_delay: float, backoff: float) -> Tuple[float, ...]:
+    """Return the sleep before each retry, multiplied up the same way as the old loop."""
+    delays = []
+    delay = base_delay
+    for _ in range(max_attempts - 1):
+        delays.append(delay)
+        delay *= backoff
+    return tuple(delays)
+
+
 def retry(
     exceptions: Tuple[Type[BaseException], ...],
     max_attempts: int = 3,
@@ -13,22 +25,28 @@ def retry(
     backoff: float = 2.0,
 ):
     """Retry a function when it raises one of the provided exceptions."""
+    # Fixed per decoration, so the backoff arithmetic is done once rather than per failure.
+    delays = _delay_schedule(max(1, int(max_attempts)), base_delay, backoff)
+    last = len(delays) - 1
 
     def decorator(func: Callable):
         """Wrap a function with retry logic."""
         def wrapper(*args, **kwargs):
             """Execute the wrapped function with retries."""
-            attempt = 1
-            delay = base_delay
-            while True:
+            # Fast path: most calls succeed first time and never enter the retry loop.
+            try:
+                return func(*args, **kwargs)
+            except exceptions:
+                if not delays:
+                    raise
+            sleep = time.sleep
+            for i, delay in enumerate(delays):
+                sleep(delay)
                 try:
                     return func(*args, **kwargs)
                 except exceptions:
-                    if attempt >= max_attempts:
+                    if i == last:
                         raise
-                    time.sleep(delay)
-                    attempt += 1
-                    delay *= backoff
 
         return wrapper
 
@@ -6,13 +6,14 @@ import os
 import random
 from typing import Optional
 
-import numpy as np
-
 
 def set_seed(seed: Optional[int]) -> None:
     """Set RNG seeds for reproducibility across common libraries."""
     if seed is None:
         return
+    # Imported here so processes that never seed do not pay numpy's import cost.
+    import numpy as np
+
     random.seed(seed)
     np.random.seed(seed)
     os.environ["PYTHONHASHSEED"] = str(seed)
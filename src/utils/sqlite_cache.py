@@ -0,0 +1,58 @@
+"""SQLite-backed key/value cache used to avoid repeated LLM calls."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Any, Optional
+
+from .jsonio import dumps_bytes, loads
+
+
+class SQLiteCache:
+    """WAL-mode SQLite cache with the same get/set interface as DiskCache."""
+
+    def __init__(self, path: str, commit_every: int = 32):
+        """Open (or create) the cache database at path."""
+        self.path = path
+        self.commit_every = max(1, int(commit_every))
+        self._pending = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Workers share one connection; the lock serializes access to it.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v BLOB)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return cached value for key if present."""
+        with self._lock:
+            row = self._conn.execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return loads(zlib.decompress(row[0]))
+
+    def set(self, key: str, value: Any) -> None:
+        """Insert a value, committing in batches of commit_every writes."""
+        blob = zlib.compress(dumps_bytes(value), 1)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO kv (k, v) VALUES (?, ?)", (key, blob))
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._conn.commit()
+                self._pending = 0
+
+    def flush(self) -> None:
+        """Commit any writes still pending."""
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Flush pending writes and close the connection."""
+        self.flush()
+        self._conn.close()
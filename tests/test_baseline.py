@@ -0,0 +1,130 @@
+"""Tests for the single-call baseline runner."""
+
+import asyncio
+
+from data.schema import TaskExample
+from systems.baseline_direct import run_baseline
+from utils.cache import open_cache
+
+
+class FakeAsyncClient:
+    """Fake client exposing both chat and achat."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = 0
+
+    def chat(self, model, messages, temperature=0.0, max_tokens=None, **kwargs):
+        raise AssertionError("async path expected")
+
+    async def achat(self, model, messages, temperature=0.0, max_tokens=None, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return "Final: B" if "second" in messages[-1]["content"] else "Final: A", {}
+
+    async def aclose(self):
+        self.closed += 1
+
+
+def test_run_baseline_async_keeps_order_and_bound():
+    """Async fan-out should preserve input order and respect the concurrency cap."""
+    examples = [
+        TaskExample(
+            id=str(i),
+            task_type="multiple_choice",
+            question="second" if i % 2 else "first",
+            choices=["x", "y"],
+            label="B" if i % 2 else "A",
+        )
+        for i in range(10)
+    ]
+    client = FakeAsyncClient()
+    records = run_baseline(examples, client, "m", concurrency=3)
+    assert [r["id"] for r in records] == [str(i) for i in range(10)]
+    assert all(r["correct"] for r in records)
+    assert client.peak <= 3
+    assert client.closed == 1
+
+
+class LoopClient(FakeAsyncClient):
+    """Fake client that owns a long-lived event loop, like OpenAICompatClient."""
+
+    def __init__(self):
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+        self.loops = set()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    async def achat(self, model, messages, temperature=0.0, max_tokens=None, **kwargs):
+        self.loops.add(asyncio.get_running_loop())
+        return await super().achat(model, messages, temperature, max_tokens, **kwargs)
+
+
+def test_run_baseline_reuses_client_loop_across_batches():
+    """Batches should share the client's loop and leave its async pool open."""
+    examples = [
+        TaskExample(id=str(i), task_type="multiple_choice", question="first", choices=["x", "y"], label="A")
+        for i in range(6)
+    ]
+    client = LoopClient()
+    run_baseline(examples[:3], client, "m", concurrency=2)
+    run_baseline(examples[3:], client, "m", concurrency=2)
+    client.loop.close()
+    assert client.loops == {client.loop}
+    assert client.closed == 0
+
+
+class CountingClient:
+    """Sync-only fake client that counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def chat(self, model, messages, temperature=0.0, max_tokens=None, **kwargs):
+        self.calls += 1
+        return "Final: A", {}
+
+
+def test_run_baseline_serves_hits_without_calls(tmp_path):
+    """A second pass over the same examples should be answered from the cache."""
+    examples = [
+        TaskExample(id=str(i), task_type="multiple_choice", question=f"q{i}", choices=["x", "y"], label="A")
+        for i in range(4)
+    ]
+    cache = open_cache(str(tmp_path), backend="sqlite", resample=False)
+    first, second = CountingClient(), CountingClient()
+    run_baseline(examples, first, "m", cache=cache, concurrency=2)
+    records = run_baseline(examples, second, "m", cache=cache, concurrency=2)
+    cache.close()
+    assert first.calls == 4
+    assert second.calls == 0
+    assert [r["id"] for r in records] == ["0", "1", "2", "3"]
+
+
+def test_run_baseline_hit_keeps_current_example_fields(tmp_path):
+    """A shared-question hit must report the current example's id, label and meta."""
+    first = TaskExample(
+        id="fpb-0", task_type="multiple_choice", question="Same?", choices=["x", "y"], label="A"
+    )
+    second = TaskExample(
+        id="fpb-7",
+        task_type="multiple_choice",
+        question="Same?",
+        choices=["x", "y"],
+        label="B",
+        meta={"dataset": "other"},
+    )
+    cache = open_cache(str(tmp_path), backend="sqlite", resample=False)
+    client = CountingClient()
+    run_baseline([first], client, "m", cache=cache)
+    (record,) = run_baseline([second], client, "m", cache=cache)
+    cache.close()
+    assert client.calls == 1
+    assert (record["id"], record["label"], record["prediction"]) == ("fpb-7", "B", "A")
+    assert record["correct"] is False
+    assert record["meta"] == {"dataset": "other"}
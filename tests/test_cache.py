@@ -0,0 +1,96 @@
+"""Unit tests for the response and config cache helpers."""
+
+import os
+
+from utils import jsonio
+from utils.cache import DiskCache, SampleCache, make_cache_key
+from utils.file_cache import cached_yaml
+from utils.sqlite_cache import SQLiteCache
+
+
+def test_sqlite_cache_roundtrip(tmp_path):
+    """Values should survive a close/reopen cycle."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path, commit_every=2)
+    cache.set("k1", {"prediction": "A", "trace": [1, 2]})
+    cache.close()
+    reopened = SQLiteCache(path)
+    assert reopened.get("k1") == {"prediction": "A", "trace": [1, 2]}
+    assert reopened.get("missing") is None
+    reopened.close()
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    """The JSONL backend should persist on every set and compact on close."""
+    path = str(tmp_path / "cache.jsonl")
+    DiskCache(path).set("k1", {"prediction": "B"})
+    assert DiskCache(path).get("k1") == {"prediction": "B"}
+
+    cache = DiskCache(path)
+    cache.set("k1", {"prediction": "C"})
+    cache.set("k2", [1, 2])
+    cache.close()
+    with open(path) as f:
+        assert len(f.readlines()) == 2
+    reopened = DiskCache(path)
+    assert reopened.get("k1") == {"prediction": "C"}
+    assert reopened.get("k2") == [1, 2]
+
+
+def test_cached_yaml_reloads_on_change(tmp_path):
+    """Edits to the file should invalidate the cached parse."""
+    path = tmp_path / "cfg.yaml"
+    path.write_text("seed: 1\n")
+    first = cached_yaml(str(path))
+    first["seed"] = 99
+    assert cached_yaml(str(path)) == {"seed": 1}
+    path.write_text("seed: 22\n")
+    os.utime(path, ns=(0, 10**18))
+    assert cached_yaml(str(path)) == {"seed": 22}
+
+
+def test_sample_cache_replays_samples_per_session(tmp_path):
+    """Each session should walk the stored samples in order before missing."""
+    path = str(tmp_path / "cache.sqlite")
+    first = SampleCache(SQLiteCache(path))
+    assert first.get("k") is None
+    first.set("k", "s0")
+    assert first.get("k") is None
+    first.set("k", "s1")
+    first.close()
+
+    second = SampleCache(SQLiteCache(path))
+    assert [second.get("k"), second.get("k"), second.get("k")] == ["s0", "s1", None]
+    second.close()
+
+    greedy = SampleCache(SQLiteCache(path), resample=False)
+    assert [greedy.get("k"), greedy.get("k")] == ["s0", "s0"]
+    greedy.close()
+
+
+def test_sample_cache_keeps_samples_appended_by_another_writer(tmp_path):
+    """A set after a miss must append to the current entry, not a stale read."""
+    path = str(tmp_path / "cache.jsonl")
+    backend = DiskCache(path)
+    mine, other = SampleCache(backend), SampleCache(backend)
+    assert mine.get("k") is None
+    assert other.get("k") is None
+    other.set("k", "theirs")
+    mine.set("k", "mine")
+    assert backend.get("k") == ["theirs", "mine"]
+    backend.close()
+
+
+def test_make_cache_key_same_without_orjson(monkeypatch):
+    """Keys must not depend on whether orjson is installed."""
+    payload = {
+        "model": "m",
+        "messages": [{"role": "user", "content": "Prix: 5€"}],
+        "temperature": 0.7,
+        "limits": {"big": 1e16, "small": 1e-7},
+        "by_index": {3: "c", 10: "j"},
+    }
+    key = make_cache_key(payload, namespace="baseline")
+    monkeypatch.setattr(jsonio, "orjson", None)
+    assert make_cache_key(dict(reversed(list(payload.items()))), namespace="baseline") == key
+    assert key.startswith("baseline:")
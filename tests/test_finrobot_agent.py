@@ -0,0 +1,244 @@
+"""Tests for the FinRobot agent runner's recovery paths."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from data.schema import TaskExample
+from systems.finrobot_agent import FinRobotAgentRunner, run_agent
+from utils.cache import open_cache
+
+
+class FlakyUserProxy:
+    """User proxy whose chat fails mid-session, after the Solver has already replied."""
+
+    def __init__(self, group_chat):
+        self.group_chat = group_chat
+
+    def initiate_chat(self, representative, message, silent=True):
+        self.group_chat.messages.extend(
+            [{"name": "User", "content": message}, {"name": "Solver", "content": "Looks like B."}]
+        )
+        raise RuntimeError("rate limited")
+
+
+class FlakyGroup:
+    """Group stand-in whose session always dies before the Final turn."""
+
+    def __init__(self, *args, **kwargs):
+        self.group_chat = SimpleNamespace(messages=[])
+        self.user_proxy = FlakyUserProxy(self.group_chat)
+        self.representative = object()
+
+    def reset(self):
+        return None
+
+
+class LateFailGroup:
+    """Group stand-in whose session completes but whose post-session reset fails."""
+
+    def __init__(self, *args, **kwargs):
+        self.group_chat = SimpleNamespace(messages=[])
+        self.user_proxy = SimpleNamespace(initiate_chat=self.chat)
+        self.representative = object()
+
+    def chat(self, representative, message, silent=True):
+        self.group_chat.messages.extend(
+            [{"name": "User", "content": message}, {"name": "Solver", "content": "Looks like B."}]
+        )
+        return SimpleNamespace(chat_history=list(self.group_chat.messages))
+
+    def reset(self):
+        raise RuntimeError("reset failed")
+
+
+class RecordingClient:
+    """Client that answers the direct Final call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, model, messages, temperature=0.0, max_tokens=None, **kwargs):
+        self.calls.append(messages)
+        return "Answer: B\nTERMINATE", {}
+
+
+LLM_CONFIG = {"config_list": [{"model": "m", "api_key": "k", "base_url": "u"}]}
+NO_RETRIES = {"mode": "minimal", "api_max_retries": 0, "retry_on_invalid": False}
+
+
+def test_post_session_failure_finishes_with_one_direct_call(monkeypatch, tmp_path):
+    """A failure after the session finished is recovered with one uncached Final call."""
+    monkeypatch.setattr("systems.finrobot_agent.MultiAssistant", LateFailGroup)
+    example = TaskExample(
+        id="ex-1", task_type="multiple_choice", question="Pick B", choices=["x", "y"], label="B"
+    )
+    client = RecordingClient()
+    cache = open_cache(str(tmp_path), backend="sqlite", resample=False)
+    (record,) = run_agent(
+        [example], LLM_CONFIG, cache=cache, finrobot_config={"mode": "minimal"}, client=client
+    )
+
+    assert record["prediction"] == "B"
+    assert record["meta"]["final_only_retry"] is True
+    assert record["meta"]["api_retry_used"] == 0
+    assert len(client.calls) == 1
+    assert "Solver: Looks like B." in client.calls[0][1]["content"]
+
+    # Fallback answers are not agent results, so they are never served from the cache.
+    run_agent(
+        [example], LLM_CONFIG, cache=cache, finrobot_config={"mode": "minimal"}, client=client
+    )
+    cache.close()
+    assert len(client.calls) == 2
+
+
+def test_mid_session_failure_takes_error_path(monkeypatch):
+    """Provider or agent errors during the session must not be finished by a direct call."""
+    monkeypatch.setattr("systems.finrobot_agent.MultiAssistant", FlakyGroup)
+    example = TaskExample(
+        id="ex-1", task_type="multiple_choice", question="Pick B", choices=["x", "y"], label="B"
+    )
+    client = RecordingClient()
+    (record,) = run_agent([example], LLM_CONFIG, finrobot_config=NO_RETRIES, client=client)
+
+    assert client.calls == []
+    assert "final_only_retry" not in record["meta"]
+    assert record["meta"]["api_error"] == "rate limited"
+    assert record["prediction"] == "INVALID"
+
+
+def test_group_rebuild_failure_does_not_reuse_previous_transcript(monkeypatch):
+    """A failed rebuild must not finish the next example from the last one's turns."""
+    builds = []
+
+    class BreaksOnRebuild(LateFailGroup):
+        def __init__(self, *args, **kwargs):
+            builds.append(1)
+            if len(builds) > 1:
+                raise RuntimeError("group build failed")
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr("systems.finrobot_agent.MultiAssistant", BreaksOnRebuild)
+    examples = [
+        TaskExample(
+            id=f"ex-{i}", task_type="multiple_choice", question=q, choices=["x", "y"], label=q[-1]
+        )
+        for i, q in enumerate(["Pick B", "Pick A"], start=1)
+    ]
+    client = RecordingClient()
+    first, second = run_agent(examples, LLM_CONFIG, finrobot_config=NO_RETRIES, client=client)
+
+    assert first["meta"]["final_only_retry"] is True
+    assert len(client.calls) == 1
+    assert "final_only_retry" not in second["meta"]
+    assert second["meta"]["api_error"] == "group build failed"
+    assert second["prediction"] == "INVALID"
+
+
+def test_shared_executor_keeps_one_group_per_worker(monkeypatch):
+    """Batches run on a shared pool should reuse each worker thread's group."""
+    builds = []
+    lock = threading.Lock()
+
+    class CountingGroup:
+        def __init__(self, *args, **kwargs):
+            with lock:
+                builds.append(1)
+            self.group_chat = SimpleNamespace(messages=[])
+            self.representative = object()
+            self.user_proxy = SimpleNamespace(
+                initiate_chat=lambda *a, **k: SimpleNamespace(
+                    chat_history=[{"name": "Final", "content": "Answer: A"}]
+                )
+            )
+
+        def reset(self):
+            return None
+
+    monkeypatch.setattr("systems.finrobot_agent.MultiAssistant", CountingGroup)
+    llm_config = {"config_list": [{"model": "m", "api_key": "k", "base_url": "u"}]}
+    runner = FinRobotAgentRunner(llm_config=llm_config, finrobot_config={"mode": "minimal"})
+    examples = [
+        TaskExample(
+            id=f"ex-{i}", task_type="multiple_choice", question="Pick A", choices=["x", "y"], label="A"
+        )
+        for i in range(64)
+    ]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for start in range(0, len(examples), 8):
+            records = run_agent(
+                examples[start : start + 8], llm_config, concurrency=4, runner=runner, executor=pool
+            )
+            assert [r["prediction"] for r in records] == ["A"] * 8
+    assert len(builds) <= 4
+
+
+def _answer_a_group(sessions):
+    """Return a group class whose sessions always end with 'Answer: A', logging each run."""
+
+    class AnswerA:
+        def __init__(self, *args, **kwargs):
+            self.group_chat = SimpleNamespace(messages=[])
+            self.representative = object()
+            self.user_proxy = SimpleNamespace(initiate_chat=self.chat)
+
+        def chat(self, *args, **kwargs):
+            sessions.append(1)
+            return SimpleNamespace(chat_history=[{"name": "Final", "content": "Answer: A"}])
+
+        def reset(self):
+            return None
+
+    return AnswerA
+
+
+def test_cache_hit_rebuilds_record_for_current_example(monkeypatch, tmp_path):
+    """Examples sharing a question share the cached answer, not id, label or meta."""
+    sessions = []
+    monkeypatch.setattr("systems.finrobot_agent.MultiAssistant", _answer_a_group(sessions))
+    llm_config = {"config_list": [{"model": "m", "api_key": "k", "base_url": "u"}]}
+    first = TaskExample(
+        id="fpb-0", task_type="multiple_choice", question="Same?", choices=["x", "y"], label="A"
+    )
+    second = TaskExample(
+        id="fpb-7",
+        task_type="multiple_choice",
+        question="Same?",
+        choices=["x", "y"],
+        label="B",
+        meta={"dataset": "other"},
+    )
+    cache = open_cache(str(tmp_path), backend="sqlite", resample=False)
+    run_agent([first], llm_config, cache=cache, finrobot_config={"mode": "minimal"})
+    (record,) = run_agent([second], llm_config, cache=cache, finrobot_config={"mode": "minimal"})
+    cache.close()
+
+    assert len(sessions) == 1
+    assert (record["id"], record["label"], record["prediction"]) == ("fpb-7", "B", "A")
+    assert record["correct"] is False
+    assert record["meta"]["dataset"] == "other"
+    assert record["trace"]
+
+
+def test_duplicate_questions_in_one_run_keep_their_own_ids(monkeypatch, tmp_path):
+    """Within one run, a repeated question hits the cache but keeps its own id and label."""
+    monkeypatch.setattr("systems.finrobot_agent.MultiAssistant", _answer_a_group([]))
+    llm_config = {"config_list": [{"model": "m", "api_key": "k", "base_url": "u"}]}
+    examples = [
+        TaskExample(
+            id=f"fpb-{i}",
+            task_type="multiple_choice",
+            question="Same?",
+            choices=["x", "y"],
+            label=label,
+        )
+        for i, label in enumerate("AB")
+    ]
+    cache = open_cache(str(tmp_path), backend="json", resample=False)
+    records = run_agent(examples, llm_config, cache=cache, finrobot_config={"mode": "minimal"})
+    cache.close()
+    assert [(r["id"], r["label"], r["correct"]) for r in records] == [
+        ("fpb-0", "A", True),
+        ("fpb-1", "B", False),
+    ]
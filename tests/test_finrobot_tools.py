@@ -0,0 +1,19 @@
+"""Tests for FinRobot toolkit selection."""
+
+from systems.finrobot_tools import build_toolkits, resolve_toolkits
+
+
+def _failing_import(name):
+    raise ImportError(name)
+
+
+def test_toolkits_import_lazily_and_report_failures(monkeypatch):
+    """Selection should not import modules; failed imports surface on resolve."""
+    monkeypatch.setattr("importlib.import_module", _failing_import)
+    toolkits, info = build_toolkits({"toolsets": ["text", "nope"]})
+    assert info["enabled"] == ["text"]
+    assert info["skipped"] == [{"name": "nope", "reason": "unknown_toolset"}]
+
+    assert resolve_toolkits(toolkits, info) == []
+    assert info["enabled"] == []
+    assert info["skipped"][-1]["reason"] == "import_failed"
@@ -0,0 +1,52 @@
+"""Unit tests for dataset sampling in the loader."""
+
+from data import loader
+
+
+class FakeDataset:
+    """Minimal stand-in for a HuggingFace map-style dataset."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.features = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def select(self, indices):
+        return FakeDataset([self.rows[i] for i in indices])
+
+
+def _cfg(**overrides):
+    cfg = {
+        "seed": 7,
+        "max_samples_per_dataset": 4,
+        "datasets": [
+            {
+                "name": "toy",
+                "hf_path": "toy/path",
+                "question_field": "query",
+                "choices_field": "choices",
+                "label_field": "gold",
+                "label_type": "index",
+            }
+        ],
+    }
+    cfg.update(overrides)
+    return cfg
+
+
+def test_load_examples_is_deterministic(monkeypatch):
+    """Sampling should honour the budget and be stable for a fixed seed."""
+    rows = [{"id": i, "query": f"Q{i}", "choices": ["x", "y"], "gold": i % 2} for i in range(20)]
+    monkeypatch.setattr(loader, "_load_hf_dataset", lambda ds_cfg, streaming=False: FakeDataset(rows))
+
+    first = loader.load_examples(_cfg())
+    second = loader.load_examples(_cfg())
+    assert len(first) == 4
+    assert [ex.id for ex in first] == [ex.id for ex in second]
+    assert [ex.id for ex in first] == [ex.id for ex in loader.iter_examples(_cfg())]
+    assert all(ex.label == "AB"[int(ex.id.split("-")[1]) % 2] for ex in first)
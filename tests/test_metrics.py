@@ -0,0 +1,44 @@
+"""Unit tests for evaluation metrics."""
+
+import pytest
+
+from eval.metrics import compute_metrics, macro_f1
+
+
+def test_macro_f1_matches_hand_computed():
+    """Per-label F1 scores should be averaged without weighting."""
+    y_true = ["A", "A", "B", "C"]
+    y_pred = ["A", "B", "B", "INVALID"]
+    # A: p=1, r=.5 -> 2/3; B: p=.5, r=1 -> 2/3; C: 0; INVALID: 0.
+    assert macro_f1(y_true, y_pred) == pytest.approx((2 / 3 + 2 / 3) / 4)
+    records = [{"label": t, "prediction": p} for t, p in zip(y_true, y_pred)]
+    met = compute_metrics(records)
+    assert met["macro_f1"] == pytest.approx((2 / 3 + 2 / 3) / 4)
+    assert met["accuracy"] == 0.5
+
+
+def test_compute_metrics_counts_invalid():
+    """Accuracy and invalid rate should come from the same records."""
+    records = [
+        {"label": "A", "prediction": "A"},
+        {"label": "B", "prediction": "INVALID"},
+    ]
+    met = compute_metrics(records)
+    assert met["accuracy"] == 0.5
+    assert met["invalid_rate"] == 0.5
+    assert met["n"] == 2
+    assert compute_metrics([])["macro_f1"] == 0.0
+
+
+def test_compute_metrics_separates_final_only_answers():
+    """Final-only fallback answers should be counted apart from full agent sessions."""
+    records = [
+        {"label": "A", "prediction": "A"},
+        {"label": "B", "prediction": "A"},
+        {"label": "B", "prediction": "B", "meta": {"final_only_retry": True}},
+        {"label": "A", "prediction": "A", "meta": {"final_only_retry": True}},
+    ]
+    met = compute_metrics(records)
+    assert met["accuracy"] == 0.75
+    assert met["final_only_rate"] == 0.5
+    assert met["accuracy_excl_final_only"] == 0.5
@@ -13,3 +13,20 @@ def test_extract_label_basic():
     """Label extraction should match the label set."""
     text = "positive"
     assert extract_label(text, ["positive", "negative"]) == "positive"
+
+
+def test_extract_choice_text_fallback_prefers_first_choice():
+    """Choice-text fallback should return the earliest listed matching choice."""
+    text = "it is gamma or maybe beta"
+    assert extract_choice(text, ["alpha", "Beta", "", "gamma"]) == "B"
+
+
+def test_extract_label_prefers_longest_label():
+    """Longer labels should win over labels they contain."""
+    text = "Sentiment: very positive"
+    assert extract_label(text, ["positive", "very positive"]) == "very positive"
+
+
+def test_extract_choice_text_fallback_casefolds():
+    """Choice text should match regardless of Unicode case variants."""
+    assert extract_choice("Die STRASSE ist richtig", ["Weg", "Straße"]) == "B"
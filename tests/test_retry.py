@@ -0,0 +1,48 @@
+"""Unit tests for the retry decorator."""
+
+import pytest
+
+from utils import retry as retry_mod
+from utils.retry import retry
+
+
+def test_retry_backs_off_then_raises(monkeypatch):
+    """Failures should sleep with exponential backoff and re-raise after max_attempts."""
+    sleeps = []
+    monkeypatch.setattr(retry_mod.time, "sleep", sleeps.append)
+    calls = []
+
+    @retry((ValueError,), max_attempts=3, base_delay=0.5, backoff=2.0)
+    def always_fails():
+        calls.append(1)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        always_fails()
+    assert len(calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_retry_returns_first_success(monkeypatch):
+    """A call that recovers should return its value without further attempts."""
+    sleeps = []
+    monkeypatch.setattr(retry_mod.time, "sleep", sleeps.append)
+    outcomes = iter([ValueError("flaky"), "ok"])
+
+    @retry((ValueError,), max_attempts=5, base_delay=1.0)
+    def flaky():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert flaky() == "ok"
+    assert sleeps == [1.0]
+
+    @retry((ValueError,), max_attempts=1)
+    def once():
+        raise ValueError("no retries")
+
+    with pytest.raises(ValueError):
+        once()
+    assert sleeps == [1.0]
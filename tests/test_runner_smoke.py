@@ -1,7 +1,10 @@
 """Smoke test for the end-to-end evaluation runner."""
 
+import os
 from types import SimpleNamespace
 
+import pytest
+
 from data.schema import TaskExample
 from eval.runner import run_eval
 
@@ -90,3 +93,43 @@ def test_run_eval_smoke(tmp_path, monkeypatch):
 
     run_dir = run_eval(cfg)
     assert run_dir is not None
+    # The buffered run.log should be complete once run_eval returns.
+    with open(os.path.join(run_dir, "run.log")) as f:
+        assert "Run complete." in f.read()
+
+
+def test_run_eval_closes_cache_and_client_on_failure(tmp_path, monkeypatch):
+    """A pass that raises must still flush the cache and release the client."""
+    example = TaskExample(
+        id="ex-1", task_type="multiple_choice", question="Pick A", choices=["A", "B"], label="A"
+    )
+    monkeypatch.setattr("eval.runner.load_examples", lambda cfg: [example])
+
+    closed = []
+
+    class ClosingClient(FakeClient):
+        def close(self):
+            closed.append("client")
+
+    class RecordingCache:
+        def close(self):
+            closed.append("cache")
+
+    monkeypatch.setattr("eval.runner.make_openai_client", lambda cfg: ClosingClient("A"))
+    monkeypatch.setattr("eval.runner.open_cache", lambda *args, **kwargs: RecordingCache())
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr("systems.baseline_direct.run_baseline", boom)
+    cfg = {
+        "provider": "ollama",
+        "base_url": "http://localhost:11434/v1/",
+        "model": "dummy",
+        "output_dir": str(tmp_path),
+        "run_agent": False,
+        "datasets": [{"name": "dummy"}],
+    }
+    with pytest.raises(RuntimeError, match="provider down"):
+        run_eval(cfg)
+    assert closed == ["cache", "client"]